@@ -3,74 +3,247 @@
 Petit utilitaire invoqué depuis le frontend Next.js.
 Il lit un JSON sur l'entrée standard, exécute run_analysis_pipeline
 et renvoie la réponse JSON sérialisée ou un objet d'erreur.
+
+À lancer depuis la racine du dépôt : `python -m backend.api_handler`.
+Avec --serve, le processus reste actif et traite une requête par ligne
+(NDJSON) ; un champ "id" éventuel est recopié dans la réponse, et les résultats
+sont mis en cache dans ce seul processus (ResultCache, TTL ANALYZER_CACHE_TTL).
 """
 
 from __future__ import annotations
 
+import argparse
+import io
 import json
+import operator
+import os
+import select
 import sys
-from pathlib import Path
-from typing import Any, Dict, Optional
-
-ROOT_DIR = Path(__file__).resolve().parents[1]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.append(str(ROOT_DIR))
-
-from backend.app import DEFAULT_TERMINAL_GROWTH, DEFAULT_WACC, run_analysis_pipeline
-
-ALLOWED_OVERRIDES = {
-    "price",
-    "eps",
-    "growth_rate",
-    "book_value_per_share",
-    "shares_outstanding",
-    "free_cash_flow",
-}
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
+if TYPE_CHECKING:
+    from backend.server.stores import ResultCache
 
-def to_float(value: Any, fallback: float) -> float:
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None  # type: ignore[assignment]
+
+# Sans wheel orjson (vieille glibc, musl…) : ujson si présent, sinon la stdlib.
+fallback_json: Any = json
+if orjson is None:
     try:
-        if value is None:
-            return fallback
+        import ujson as fallback_json  # type: ignore[import-untyped,no-redef]
+    except ImportError:  # pragma: no cover - ujson est optionnel
+        pass
+
+# Les scalaires/tableaux numpy et les dates issus du pipeline sont sérialisés nativement.
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+ALLOWED_OVERRIDES: frozenset[str] = frozenset(
+    {
+        "price",
+        "eps",
+        "growth_rate",
+        "book_value_per_share",
+        "shares_outstanding",
+        "free_cash_flow",
+    }
+)
+
+# Code de sortie distinct lorsque l'analyse a réussi mais que sa sérialisation échoue.
+SERIALIZATION_ERROR_EXIT = 2
+
+_PAYLOAD_DEFAULTS: Dict[str, Any] = {
+    "ticker": "",
+    "wacc": None,
+    "terminalGrowth": None,
+    "sector": None,
+    "overrides": None,
+}
+_get_fields = operator.itemgetter("ticker", "wacc", "terminalGrowth", "sector", "overrides")
+
+
+def _as_float(value: object) -> Optional[float]:
+    if type(value) is float:
+        return value
+    if type(value) is int:
         return float(value)
-    except (TypeError, ValueError):
-        return fallback
+    # bool et chaînes numériques ("0.08") restent acceptés comme auparavant.
+    if isinstance(value, (str, int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
 
+def to_float(value: object, fallback: float) -> float:
+    number = _as_float(value)
+    return fallback if number is None else number
 
-def parse_overrides(values: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+
+def parse_overrides(values: Optional[Dict[str, object]]) -> Optional[Dict[str, float]]:
     if not values:
         return None
-    overrides: Dict[str, float] = {}
-    for key, raw in values.items():
-        if key not in ALLOWED_OVERRIDES:
-            continue
+    allowed = ALLOWED_OVERRIDES
+    # Intersection calculée en C : évite de parcourir un formulaire complet sans clé utile.
+    if allowed.isdisjoint(values.keys()):
+        return None
+    as_float = _as_float
+    overrides = {
+        key: number
+        for key, raw in values.items()
+        if key in allowed and (number := as_float(raw)) is not None
+    }
+    return overrides or None
+
+
+def loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return fallback_json.loads(raw)
+
+
+def _json_default(value: Any) -> Any:
+    """Équivalent ujson/stdlib de OPT_SERIALIZE_NUMPY / datetime natif d'orjson."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=ORJSON_OPTIONS)
+    return fallback_json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def encode_line(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+    return (fallback_json.dumps(obj, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+
+
+def write_stdout(data: bytes) -> None:
+    """
+    Écrit data directement sur le descripteur de stdout, sans copie dans le tampon Python.
+    Gère les écritures partielles et un pipe non bloquant (BlockingIOError) côté Node.
+    """
+    stdout = sys.stdout
+    try:
+        fd = stdout.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        stdout.buffer.write(data)
+        stdout.flush()
+        return
+    stdout.flush()
+    view = memoryview(data)
+    while view:
         try:
-            overrides[key] = float(raw)
-        except (TypeError, ValueError):
+            written = os.write(fd, view)
+        except BlockingIOError:
+            select.select([], [fd], [])
             continue
-    return overrides or None
+        view = view[written:]
 
 
-def main() -> None:
-    raw_payload = sys.stdin.read()
-    if not raw_payload.strip():
-        print(json.dumps({"error": "Payload JSON requis."}, ensure_ascii=False))
-        sys.exit(1)
+def emit(obj: Any) -> bool:
+    """
+    Écrit l'objet sérialisé (UTF-8 + saut de ligne, un seul tampon) sur stdout.
+    Retourne False si l'objet n'était pas sérialisable (une erreur est écrite à la place).
+    """
+    serialized = True
     try:
-        payload = json.loads(raw_payload)
-    except json.JSONDecodeError:
-        print(json.dumps({"error": "Payload JSON invalide."}, ensure_ascii=False))
-        sys.exit(1)
+        line = encode_line(obj)
+    except (TypeError, ValueError, OverflowError) as exc:  # orjson.JSONEncodeError hérite de TypeError
+        line = encode_line({"error": f"Réponse non sérialisable : {exc}"})
+        serialized = False
+    write_stdout(line)
+    return serialized
+
 
-    ticker = (payload.get("ticker") or "").strip().upper()
+# (erreur, résultat) : exactement un des deux est renseigné.
+Outcome = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def failure(message: str) -> Outcome:
+    return {"error": message}, None
+
+
+def decode(raw_payload: bytes) -> Tuple[Optional[str], Dict[str, object]]:
+    if not raw_payload or raw_payload.isspace():
+        return "Payload JSON requis.", {}
+    try:
+        payload = loads(raw_payload)
+    except ValueError:
+        return "Payload JSON invalide.", {}
+    if not isinstance(payload, dict):
+        return "Payload JSON invalide.", {}
+    return None, payload
+
+
+PipelineFn = Callable[..., Tuple[Dict[str, Any], Dict[str, Any]]]
+
+_pipeline: Optional[Tuple[float, float, PipelineFn]] = None
+
+
+def load_pipeline() -> Tuple[float, float, PipelineFn]:
+    """
+    Importe backend.app (pandas, numpy, yfinance) seulement quand une analyse est lancée,
+    puis garde les valeurs par défaut (en float) et le pipeline pour les requêtes suivantes.
+    Lève ImportError si une dépendance du backend manque.
+    """
+    global _pipeline
+    if _pipeline is None:
+        os.environ.setdefault("FA_BATCH", "1")
+        from backend.app import DEFAULT_TERMINAL_GROWTH, DEFAULT_WACC, run_analysis_pipeline
+
+        _pipeline = (float(DEFAULT_WACC), float(DEFAULT_TERMINAL_GROWTH), run_analysis_pipeline)
+    return _pipeline
+
+
+def missing_dependency(exc: ImportError) -> str:
+    return f"Dépendance manquante côté backend : {exc.name or exc}"
+
+
+RequestKey = Tuple[str, float, float, Optional[str], Tuple[Tuple[str, float], ...]]
+
+
+def request_key(
+    ticker: str,
+    wacc: float,
+    terminal_growth: float,
+    sector: Any,
+    overrides: Optional[Dict[str, float]],
+) -> RequestKey:
+    """Clé tuple hashable, sans sérialisation ni condensat ; un secteur non textuel est figé par repr()."""
+    if sector is not None and not isinstance(sector, str):
+        sector = repr(sector)
+    return (ticker, wacc, terminal_growth, sector, tuple(sorted(overrides.items())) if overrides else ())
+
+
+def analyze(payload: Dict[str, object], cache: Optional[ResultCache] = None) -> Outcome:
+    raw_ticker, raw_wacc, raw_growth, sector, raw_overrides = _get_fields({**_PAYLOAD_DEFAULTS, **payload})
+    ticker = sys.intern(raw_ticker.strip().upper()) if isinstance(raw_ticker, str) else ""
     if not ticker:
-        print(json.dumps({"error": "Ticker requis."}, ensure_ascii=False))
-        sys.exit(1)
+        return failure("Ticker requis.")
 
-    wacc = to_float(payload.get("wacc"), DEFAULT_WACC)
-    terminal_growth = to_float(payload.get("terminalGrowth"), DEFAULT_TERMINAL_GROWTH)
-    sector = payload.get("sector")
-    overrides = parse_overrides(payload.get("overrides"))
+    try:
+        default_wacc, default_growth, run_analysis_pipeline = load_pipeline()
+    except ImportError as exc:
+        return failure(missing_dependency(exc))
+    wacc = to_float(raw_wacc, default_wacc)
+    terminal_growth = to_float(raw_growth, default_growth)
+    overrides = parse_overrides(raw_overrides)
+
+    key: Optional[RequestKey] = None
+    if cache is not None:
+        key = request_key(ticker, wacc, terminal_growth, sector, overrides)
+        cached = cache.get(key)
+        if cached:
+            return None, cached
 
     try:
         result, _context = run_analysis_pipeline(
@@ -82,10 +255,57 @@ def main() -> None:
             overrides=overrides,
         )
     except Exception as exc:  # pragma: no cover - surface message for the frontend
-        print(json.dumps({"error": f"Analyse impossible : {exc}"}, ensure_ascii=False))
+        return failure(f"Analyse impossible : {exc}")
+    if cache is not None:
+        cache.store(key, result)
+    return None, result
+
+
+def compute(raw_payload: bytes, cache: Optional[ResultCache] = None) -> Outcome:
+    message, payload = decode(raw_payload)
+    if message:
+        return failure(message)
+    return analyze(payload, cache)
+
+
+def serve() -> None:
+    """Boucle NDJSON : une requête JSON par ligne, une réponse JSON par ligne."""
+    try:
+        load_pipeline()
+        from backend.server.settings import get_settings
+        from backend.server.stores import ResultCache
+    except ImportError as exc:
+        emit({"error": missing_dependency(exc)})
         sys.exit(1)
+    cache = ResultCache(ttl=get_settings().cache_ttl)
+    for line in sys.stdin.buffer:
+        if line.isspace():
+            continue
+        message, payload = decode(line)
+        err, result = failure(message) if message else analyze(payload, cache)
+        response = err or result or {}
+        req_id = payload.get("id")
+        if req_id is not None:
+            response = {**response, "id": req_id}
+        emit(response)
 
-    print(json.dumps(result, ensure_ascii=False))
+
+def oneshot() -> None:
+    err, result = compute(sys.stdin.buffer.read())
+    serialized = emit(err or result)
+    sys.exit(1 if err else (0 if serialized else SERIALIZATION_ERROR_EXIT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pont JSON entre le frontend et run_analysis_pipeline.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--serve", action="store_true", help="Processus persistant (NDJSON sur stdin/stdout).")
+    mode.add_argument("--oneshot", action="store_true", help="Une seule requête puis sortie (défaut).")
+    args = parser.parse_args()
+    if args.serve:
+        serve()
+    else:
+        oneshot()
 
 
 if __name__ == "__main__":
@@ -8,45 +8,122 @@ un score de qualité et fournit une recommandation structurée.
 from __future__ import annotations
 
 import argparse
+import copy
+import hashlib
 import json
 import math
-import random
-import statistics
+import operator
+import os
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Type
 
 import numpy as np
 import pandas as pd
 import yfinance as yf
 from yfinance.search import Search
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from backend.metrics_kernels import advanced_kernel_batch, dcf_intrinsic_kernel, monte_carlo_kernel
+except ImportError:  # exécution directe `python backend/app.py` : le dossier du script est sur sys.path
+    from metrics_kernels import advanced_kernel_batch, dcf_intrinsic_kernel, monte_carlo_kernel  # type: ignore[no-redef]
+
 DEFAULT_WACC = 0.08
 DEFAULT_TERMINAL_GROWTH = 0.025
 
-SECTOR_MULTIPLES = {
-    "Technology": {"pe": 27.0, "pb": 8.0, "ps": 6.0, "ev_ebitda": 20.0},
-    "Communication Services": {"pe": 18.0, "pb": 4.0, "ps": 4.0, "ev_ebitda": 12.0},
-    "Consumer Cyclical": {"pe": 22.0, "pb": 5.0, "ps": 2.0, "ev_ebitda": 13.0},
-    "Consumer Defensive": {"pe": 21.0, "pb": 4.0, "ps": 2.5, "ev_ebitda": 14.0},
-    "Financial Services": {"pe": 12.0, "pb": 1.5, "ps": 2.0, "ev_ebitda": 10.0},
-    "Healthcare": {"pe": 20.0, "pb": 4.0, "ps": 5.0, "ev_ebitda": 13.0},
-    "Industrials": {"pe": 18.0, "pb": 3.0, "ps": 1.5, "ev_ebitda": 11.0},
-    "Energy": {"pe": 9.0, "pb": 1.5, "ps": 1.0, "ev_ebitda": 5.0},
-    "Basic Materials": {"pe": 17.0, "pb": 2.0, "ps": 1.5, "ev_ebitda": 8.0},
-    "Utilities": {"pe": 16.0, "pb": 1.7, "ps": 2.0, "ev_ebitda": 9.0},
-    "Real Estate": {"pe": 25.0, "pb": 2.2, "ps": 6.0, "ev_ebitda": 18.0},
-    "Default": {"pe": 18.0, "pb": 2.5, "ps": 2.0, "ev_ebitda": 10.0},
-}
+# FA_BATCH=1 (positionné par api_handler avant l'import) : exécution non interactive,
+# la saisie manuelle des données manquantes n'est jamais proposée.
+BATCH_MODE = os.getenv("FA_BATCH", "") not in ("", "0")
+
+# Durée (secondes) pendant laquelle un Ticker yfinance et ses historiques sont réutilisés.
+TICKER_CACHE_TTL = int(os.getenv("ANALYZER_TICKER_CACHE_TTL", "300"))
+
+# Cache disque (JSON) des news et recherches Yahoo, partagé entre exécutions ; --no-cache le contourne.
+DISK_CACHE_DIR = Path(os.getenv("ANALYZER_YF_CACHE_DIR", ".cache/yf"))
+DISK_CACHE_TTL = int(os.getenv("ANALYZER_YF_CACHE_TTL", "86400"))
+DISK_CACHE_ENABLED = DISK_CACHE_TTL > 0
+# Historiques de marché communs à toutes les analyses (SPY, ^GSPC, ^VIX), partagés N secondes.
+MACRO_CACHE_TTL = int(os.getenv("ANALYZER_MACRO_CACHE_TTL", "300"))
+
+# Pool partagé pour les requêtes réseau annexes du pipeline (historiques, benchmark, VIX, news).
+# yfinance réutilise déjà une session HTTP unique (keep-alive) pour tout le processus.
+# Créé à la première utilisation et recréé après shutdown_io() (nouveau lifespan, CLI…).
+_IO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_IO_EXECUTOR_LOCK = threading.Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    global _IO_EXECUTOR
+    with _IO_EXECUTOR_LOCK:
+        if _IO_EXECUTOR is None:
+            _IO_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analyzer-io")
+        return _IO_EXECUTOR
+
 
-SCENARIO_CONFIG = [
-    {"name": "Bear", "weight": 0.25, "growth_mult": 0.5, "wacc_delta": 0.02, "terminal_delta": -0.01},
-    {"name": "Base", "weight": 0.5, "growth_mult": 1.0, "wacc_delta": 0.0, "terminal_delta": 0.0},
-    {"name": "Bull", "weight": 0.25, "growth_mult": 1.2, "wacc_delta": -0.02, "terminal_delta": 0.005},
-]
+def shutdown_io() -> None:
+    """Arrête le pool réseau partagé (fin de vie de l'API) ; les requêtes en attente sont annulées."""
+    global _IO_EXECUTOR
+    with _IO_EXECUTOR_LOCK:
+        executor, _IO_EXECUTOR = _IO_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
 
+# Générateur PCG64 unique pour le Monte Carlo (pas de réinitialisation à chaque appel).
+_RNG = np.random.default_rng()
 
-@dataclass
+class SectorMultiples(NamedTuple):
+    pe: float
+    pb: float
+    ps: float
+    ev_ebitda: float
+
+
+class Scenario(NamedTuple):
+    name: str
+    weight: float
+    growth_mult: float
+    wacc_delta: float
+    terminal_delta: float
+
+
+# Table figée à l'import : accès par attribut, aucune reconstruction par appel.
+SECTOR_MULTIPLES: Mapping[str, SectorMultiples] = MappingProxyType(
+    {
+        "Technology": SectorMultiples(pe=27.0, pb=8.0, ps=6.0, ev_ebitda=20.0),
+        "Communication Services": SectorMultiples(pe=18.0, pb=4.0, ps=4.0, ev_ebitda=12.0),
+        "Consumer Cyclical": SectorMultiples(pe=22.0, pb=5.0, ps=2.0, ev_ebitda=13.0),
+        "Consumer Defensive": SectorMultiples(pe=21.0, pb=4.0, ps=2.5, ev_ebitda=14.0),
+        "Financial Services": SectorMultiples(pe=12.0, pb=1.5, ps=2.0, ev_ebitda=10.0),
+        "Healthcare": SectorMultiples(pe=20.0, pb=4.0, ps=5.0, ev_ebitda=13.0),
+        "Industrials": SectorMultiples(pe=18.0, pb=3.0, ps=1.5, ev_ebitda=11.0),
+        "Energy": SectorMultiples(pe=9.0, pb=1.5, ps=1.0, ev_ebitda=5.0),
+        "Basic Materials": SectorMultiples(pe=17.0, pb=2.0, ps=1.5, ev_ebitda=8.0),
+        "Utilities": SectorMultiples(pe=16.0, pb=1.7, ps=2.0, ev_ebitda=9.0),
+        "Real Estate": SectorMultiples(pe=25.0, pb=2.2, ps=6.0, ev_ebitda=18.0),
+        "Default": SectorMultiples(pe=18.0, pb=2.5, ps=2.0, ev_ebitda=10.0),
+    }
+)
+_DEFAULT_MULT = SECTOR_MULTIPLES["Default"]
+
+SCENARIO_CONFIG: Tuple[Scenario, ...] = (
+    Scenario(name="Bear", weight=0.25, growth_mult=0.5, wacc_delta=0.02, terminal_delta=-0.01),
+    Scenario(name="Base", weight=0.5, growth_mult=1.0, wacc_delta=0.0, terminal_delta=0.0),
+    Scenario(name="Bull", weight=0.25, growth_mult=1.2, wacc_delta=-0.02, terminal_delta=0.005),
+)
+
+
+@dataclass(slots=True)
 class FinancialData:
     """Structure centrale pour stocker les données récupérées et calculées."""
 
@@ -74,7 +151,7 @@ class FinancialData:
     roa: Optional[float]
     payout_ratio: Optional[float]
     beta: Optional[float]
-    sector_multiples: Dict[str, float]
+    sector_multiples: SectorMultiples
     historical_multiples: Dict[str, Optional[float]]
 
 
@@ -101,27 +178,117 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Ne pas demander à l'utilisateur de compléter les données manquantes.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignorer le cache disque des news et recherches Yahoo Finance.",
+    )
     return parser.parse_args()
 
 
+def _cache_bucket() -> int:
+    return int(time.time() // TICKER_CACHE_TTL)
+
+
+@lru_cache(maxsize=128)
+def _cached_ticker(symbol: str, bucket: int) -> yf.Ticker:
+    return yf.Ticker(symbol)
+
+
+@lru_cache(maxsize=256)
+def _cached_history(symbol: str, period: str, interval: str, bucket: int) -> pd.DataFrame:
+    return _cached_ticker(symbol, bucket).history(period=period, interval=interval)
+
+
+def get_ticker(symbol: str) -> yf.Ticker:
+    """
+    Ticker partagé pendant TICKER_CACHE_TTL secondes : yfinance mémorise info, états financiers
+    et news sur l'instance, ce qui évite de refaire les mêmes requêtes HTTP.
+    """
+    if TICKER_CACHE_TTL <= 0:
+        return yf.Ticker(symbol)
+    return _cached_ticker(symbol, _cache_bucket())
+
+
+def get_history(symbol: str, period: str, interval: str = "1d") -> pd.DataFrame:
+    """Historique de cours mis en cache (history() n'est pas mémorisé par yfinance). Ne pas modifier."""
+    if TICKER_CACHE_TTL <= 0:
+        return yf.Ticker(symbol).history(period=period, interval=interval)
+    return _cached_history(symbol, period, interval, _cache_bucket())
+
+
+def _disk_cache_path(namespace: str, key: str) -> Path:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return DISK_CACHE_DIR / f"{namespace}-{digest}.json"
+
+
+def disk_cache_get(namespace: str, key: str) -> Optional[Any]:
+    if not DISK_CACHE_ENABLED:
+        return None
+    path = _disk_cache_path(namespace, key)
+    try:
+        if time.time() - path.stat().st_mtime > DISK_CACHE_TTL:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def disk_cache_set(namespace: str, key: str, value: Any) -> None:
+    if not DISK_CACHE_ENABLED:
+        return
+    path = _disk_cache_path(namespace, key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+    except (OSError, TypeError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+
+
 def search_symbol(query: str) -> Tuple[Optional[str], Optional[str]]:
     """Utilise l'API de recherche Yahoo Finance pour trouver le ticker associé à un nom."""
     query = query.strip()
     if not query:
         return None, None
+    if TICKER_CACHE_TTL <= 0:
+        return _lookup_symbol(query)
+    return _cached_search(query, _cache_bucket())
+
+
+@lru_cache(maxsize=256)
+def _cached_search(query: str, bucket: int) -> Tuple[Optional[str], Optional[str]]:
+    return _lookup_symbol(query)
+
+
+def _lookup_symbol(query: str) -> Tuple[Optional[str], Optional[str]]:
+    cached = disk_cache_get("search", query.lower())
+    if cached is not None:
+        return cached[0], cached[1]
+    symbol, company_name = _search_symbol_remote(query)
+    if symbol:
+        disk_cache_set("search", query.lower(), [symbol, company_name])
+    return symbol, company_name
+
+
+def _search_quotes(query: str, max_results: int, fuzzy: bool) -> List[Dict[str, Any]]:
     try:
-        results = Search(query, max_results=8, enable_fuzzy_query=True)
-        quotes = results.quotes or []
+        results = Search(query, max_results=max_results, enable_fuzzy_query=fuzzy)
+        return results.quotes or []
     except Exception:
-        return None, None
+        return []
+
+
+def _search_symbol_remote(query: str) -> Tuple[Optional[str], Optional[str]]:
+    # Recherche exacte d'un seul résultat d'abord ; la recherche floue (plus lente) seulement si
+    # le meilleur résultat n'est pas une action.
+    quotes = _search_quotes(query, max_results=1, fuzzy=False)
+    if not quotes or quotes[0].get("quoteType") != "EQUITY":
+        quotes = _search_quotes(query, max_results=4, fuzzy=True) or quotes
     if not quotes:
         return None, None
-    preferred = None
-    for quote in quotes:
-        if quote.get("quoteType") == "EQUITY":
-            preferred = quote
-            break
-    match = preferred or quotes[0]
+    match = next((quote for quote in quotes if quote.get("quoteType") == "EQUITY"), quotes[0])
     symbol = match.get("symbol")
     if not symbol:
         return None, None
@@ -141,11 +308,20 @@ def has_core_data(data: FinancialData) -> bool:
     return False
 
 
-def safe_first(*values: Any) -> Optional[Any]:
+_NUMERIC_TYPES = (float, int)
+
+
+def safe_first(
+    *values: Any,
+    _isfinite: Callable[[float], bool] = math.isfinite,
+    _numeric: Tuple[Type[float], Type[int]] = _NUMERIC_TYPES,
+) -> Optional[Any]:
+    # Alias en arguments par défaut : lookups locaux plutôt que globaux dans la boucle.
     for value in values:
         if value is None:
             continue
-        if isinstance(value, (float, int)) and (math.isnan(value) or math.isinf(value)):
+        # isfinite couvre NaN et ±inf en un seul appel (les flottants numpy héritent de float).
+        if isinstance(value, _numeric) and not _isfinite(value):
             continue
         return value
     return None
@@ -159,22 +335,25 @@ def normalize_growth(raw: Optional[float]) -> Optional[float]:
     return raw
 
 
-def fetch_free_cash_flow(ticker_obj: yf.Ticker) -> Optional[float]:
-    try:
-        cashflow = ticker_obj.cashflow
-    except Exception:
-        cashflow = None
+def fetch_free_cash_flow(cashflow: Optional[pd.DataFrame]) -> Optional[float]:
     if cashflow is None or cashflow.empty:
         return None
 
+    # Index libellé → position construit une fois ; chaque candidat devient un accès dict + une ligne numpy.
+    positions: Dict[Any, int] = {}
+    for position, row_name in enumerate(cashflow.index):
+        positions.setdefault(row_name, position)
+    values = cashflow.to_numpy()
+
     def first_valid_row(*row_names: str) -> Optional[float]:
         for row_name in row_names:
-            if row_name not in cashflow.index:
+            position = positions.get(row_name)
+            if position is None:
                 continue
-            series = cashflow.loc[row_name]
-            for value in series:
-                if not pd.isna(value):
-                    return float(value)
+            row = values[position]
+            valid = row[~pd.isna(row)]
+            if len(valid):
+                return float(valid[0])
         return None
 
     direct_fcf = first_valid_row("FreeCashFlow", "Free Cash Flow")
@@ -184,8 +363,6 @@ def fetch_free_cash_flow(ticker_obj: yf.Ticker) -> Optional[float]:
     operating_cf = first_valid_row(
         "Total Cash From Operating Activities", "Operating Cash Flow", "Cash Flow From Continuing Operating Activities"
     )
-    if operating_cf is None:
-        operating_cf = first_valid_row("Operating Cash Flow")
     capex = first_valid_row("Capital Expenditures", "Capital Expenditure")
     if operating_cf is not None and capex is not None:
         return float(operating_cf + capex)
@@ -193,90 +370,72 @@ def fetch_free_cash_flow(ticker_obj: yf.Ticker) -> Optional[float]:
 
 
 def compute_equity(book_value: Optional[float], shares: Optional[float], info_equity: Optional[float]) -> Optional[float]:
-    if info_equity is not None and not math.isnan(info_equity):
+    if info_equity is not None and math.isfinite(info_equity):
         return info_equity
     if book_value is not None and shares is not None:
         return book_value * shares
     return None
 
 
+def _mean_or_none(values: pd.Series) -> Optional[float]:
+    finite = values.replace([np.inf, -np.inf], np.nan).dropna()
+    return float(finite.mean()) if not finite.empty else None
+
+
+def _statement_row(statement: Optional[pd.DataFrame], *row_names: str) -> Optional[pd.Series]:
+    """Première ligne présente parmi les libellés candidats d'un état financier yfinance."""
+    if statement is None or statement.empty:
+        return None
+    for row_name in row_names:
+        if row_name in statement.index:
+            return statement.loc[row_name]
+    return None
+
+
 def fetch_historical_multiples(
-    ticker_obj: yf.Ticker, shares: Optional[float], net_debt: Optional[float]
+    price_history: Optional[pd.DataFrame],
+    income_stmt: Optional[pd.DataFrame],
+    balance_sheet: Optional[pd.DataFrame],
+    shares: Optional[float],
+    net_debt: Optional[float],
 ) -> Dict[str, Optional[float]]:
     result = {"pe": None, "pb": None, "ps": None, "ev_ebitda": None}
     if shares is None or shares <= 0:
         return result
 
-    try:
-        price_history = ticker_obj.history(period="5y")
-    except Exception:
-        price_history = pd.DataFrame()
-
-    if price_history.empty:
+    if price_history is None or price_history.empty:
         return result
 
-    price_yearly = price_history["Close"].resample("Y").mean()
-    price_map = {ts.year: price for ts, price in price_yearly.items() if price and not math.isnan(price)}
-
-    earnings = ticker_obj.earnings
-    if earnings is not None and not earnings.empty:
-        pe_values: List[float] = []
-        ps_values: List[float] = []
-        for year, row in earnings.iterrows():
-            price = price_map.get(year)
-            earnings_value = row.get("Earnings")
-            revenue_value = row.get("Revenue")
-            if price and earnings_value and earnings_value != 0:
-                eps_year = earnings_value / shares
-                if eps_year:
-                    pe_values.append(price / eps_year)
-            if price and revenue_value and revenue_value > 0:
-                revenue_per_share = revenue_value / shares
-                if revenue_per_share:
-                    ps_values.append(price / revenue_per_share)
-        result["pe"] = float(np.nanmean(pe_values)) if pe_values else None
-        result["ps"] = float(np.nanmean(ps_values)) if ps_values else None
-
-    try:
-        balance_sheet = ticker_obj.balance_sheet
-    except Exception:
-        balance_sheet = pd.DataFrame()
-
-    if balance_sheet is not None and not balance_sheet.empty and "Total Stockholder Equity" in balance_sheet.index:
-        equities = balance_sheet.loc["Total Stockholder Equity"]
-        pb_values: List[float] = []
-        for column_date, equity_value in equities.items():
-            if pd.isna(equity_value):
-                continue
-            price = price_map.get(getattr(column_date, "year", None))
-            if price and shares:
-                bvps = equity_value / shares
-                if bvps:
-                    pb_values.append(price / bvps)
-        result["pb"] = float(np.nanmean(pb_values)) if pb_values else None
-
-    try:
-        financials = ticker_obj.financials
-    except Exception:
-        financials = pd.DataFrame()
-
-    if (
-        financials is not None
-        and not financials.empty
-        and "Ebitda" in financials.index
-        and net_debt is not None
-    ):
-        ebitda_series = financials.loc["Ebitda"]
-        ev_ebitda_values: List[float] = []
-        for column_date, ebitda_value in ebitda_series.items():
-            if pd.isna(ebitda_value) or ebitda_value == 0:
-                continue
-            price = price_map.get(getattr(column_date, "year", None))
-            if price:
-                market_cap_year = price * shares
-                ev = market_cap_year + net_debt
-                ev_ebitda_values.append(ev / ebitda_value)
-        result["ev_ebitda"] = float(np.nanmean(ev_ebitda_values)) if ev_ebitda_values else None
+    # Cours moyen indexé directement par année civile (pas de resample ni de DatetimeIndex intermédiaire).
+    closes = price_history["Close"]
+    price_by_year = closes.groupby(closes.index.year).mean()
+    price_by_year = price_by_year[price_by_year.notna() & (price_by_year != 0)]
+
+    def prices_for(labels: pd.Index) -> pd.Series:
+        # Colonnes datées des états financiers → cours moyen de l'année correspondante.
+        years = getattr(labels, "year", None)
+        if years is None:
+            return pd.Series(np.nan, index=labels)
+        return pd.Series(price_by_year.reindex(years).to_numpy(), index=labels)
+
+    # Compte de résultat annuel (colonnes datées) : remplace ticker.earnings, déprécié et souvent vide.
+    net_income = _statement_row(income_stmt, "Net Income")
+    if net_income is not None:
+        eps_by_year = net_income.where(net_income != 0) / shares
+        result["pe"] = _mean_or_none(prices_for(net_income.index) / eps_by_year)
+    revenue = _statement_row(income_stmt, "Total Revenue")
+    if revenue is not None:
+        sales_per_share = revenue.where(revenue > 0) / shares
+        result["ps"] = _mean_or_none(prices_for(revenue.index) / sales_per_share)
+
+    equities = _statement_row(balance_sheet, "Total Stockholder Equity")
+    if equities is not None:
+        result["pb"] = _mean_or_none(prices_for(equities.index) / (equities / shares))
+
+    ebitda_series = _statement_row(income_stmt, "EBITDA", "Ebitda")
+    if ebitda_series is not None and net_debt is not None:
+        enterprise_values = prices_for(ebitda_series.index) * shares + net_debt
+        result["ev_ebitda"] = _mean_or_none(enterprise_values / ebitda_series.where(ebitda_series != 0))
 
     return result
 
@@ -291,69 +450,133 @@ def fetch_price_history(
     Retourne une liste prête à être sérialisée pour le frontend.
     """
     try:
-        history = yf.Ticker(ticker_symbol).history(period=period, interval=interval)
+        history = get_history(ticker_symbol, period=period, interval=interval)
     except Exception:
         history = pd.DataFrame()
 
     if history is None or history.empty or "Close" not in history:
         return []
 
-    series: List[Dict[str, Any]] = []
-    closes = history["Close"]
-    for ts, close in closes.items():
-        if pd.isna(close):
-            continue
-        try:
-            date_value = ts.date().isoformat()
-        except Exception:
-            date_value = str(ts)
-        series.append({"date": date_value, "close": float(close)})
-    return series
+    closes = history["Close"].dropna()
+    if isinstance(closes.index, pd.DatetimeIndex):
+        dates = closes.index.strftime("%Y-%m-%d").tolist()
+    else:
+        dates = closes.index.astype(str).tolist()
+    return [
+        {"date": date_value, "close": close}
+        for date_value, close in zip(dates, closes.to_numpy(dtype=float).tolist())
+    ]
+
+
+MacroKey = Tuple[str, str, str]
+_MACRO_CACHE: Dict[MacroKey, Tuple[float, List[Dict[str, Any]]]] = {}
+_MACRO_LOCKS: Dict[MacroKey, threading.Lock] = {}
+_MACRO_LOCKS_GUARD = threading.Lock()
+
+
+def fetch_market_history(symbol: str, period: str = "1y", interval: str = "1wk") -> List[Dict[str, Any]]:
+    """
+    fetch_price_history pour les indices de marché, mémorisé MACRO_CACHE_TTL secondes pour tout le processus.
+    Un verrou par clé : sur un cache expiré, une seule requête part, les appels concurrents attendent son résultat.
+    Une série vide n'est pas conservée (le repli ^GSPC et l'appel suivant retentent Yahoo).
+    """
+    if MACRO_CACHE_TTL <= 0:
+        return fetch_price_history(symbol, period=period, interval=interval)
+    key = (symbol, period, interval)
+    cached = _MACRO_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < MACRO_CACHE_TTL:
+        return cached[1]
+    with _MACRO_LOCKS_GUARD:
+        lock = _MACRO_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        cached = _MACRO_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < MACRO_CACHE_TTL:
+            return cached[1]
+        history = fetch_price_history(symbol, period=period, interval=interval)
+        if history:
+            _MACRO_CACHE[key] = (time.monotonic(), history)
+        return history
 
 
 def fetch_company_news(ticker_symbol: str, limit: int = 8) -> List[Dict[str, Any]]:
     """Récupère les news récentes liées au ticker via yfinance."""
+    cache_key = f"{ticker_symbol.upper()}:{limit}"
+    cached = disk_cache_get("news", cache_key)
+    if cached is not None:
+        return cached
     try:
-        news_items = getattr(yf.Ticker(ticker_symbol), "news", []) or []
+        news_items = getattr(get_ticker(ticker_symbol), "news", []) or []
     except Exception:
         news_items = []
 
-    cleaned: List[Dict[str, Any]] = []
-    for item in news_items:
-        title = item.get("title")
-        link = item.get("link")
-        if not title or not link:
-            continue
-        publisher = item.get("publisher")
-        ts = item.get("providerPublishTime")
-        if ts:
-            try:
-                published_at = pd.to_datetime(ts, unit="s").isoformat()
-            except Exception:
-                published_at = None
-        else:
-            published_at = None
-        cleaned.append(
-            {
-                "title": title,
-                "link": link,
-                "publisher": publisher,
-                "published_at": published_at,
-            }
+    frame = pd.DataFrame.from_records([item for item in news_items if isinstance(item, dict)])
+    columns = ["title", "link", "publisher", "providerPublishTime"]
+    frame = frame.reindex(columns=columns)
+    has_text = frame[["title", "link"]].notna().all(axis=1) & frame["title"].astype(bool) & frame["link"].astype(bool)
+    frame = frame.loc[has_text].head(limit)
+
+    timestamps = pd.to_numeric(frame["providerPublishTime"], errors="coerce")
+    published = pd.to_datetime(timestamps.where(timestamps != 0), unit="s", errors="coerce")
+    published_at = published.dt.strftime("%Y-%m-%dT%H:%M:%S")
+    # Les absents (NaN/NaT) sont renvoyés en None pour rester sérialisables en JSON.
+    cleaned: List[Dict[str, Any]] = [
+        {
+            "title": title,
+            "link": link,
+            "publisher": None if pd.isna(publisher) else publisher,
+            "published_at": None if pd.isna(date_value) else date_value,
+        }
+        for title, link, publisher, date_value in zip(
+            frame["title"].tolist(), frame["link"].tolist(), frame["publisher"].tolist(), published_at.tolist()
         )
-        if len(cleaned) >= limit:
-            break
+    ]
+    if cleaned:
+        disk_cache_set("news", cache_key, cleaned)
     return cleaned
 
 
-def fetch_financial_data(ticker_symbol: str, sector_override: Optional[str] = None) -> Tuple[FinancialData, List[str]]:
-    ticker_obj = yf.Ticker(ticker_symbol)
-    assumptions: List[str] = []
-
+def _result_or(future: Future, default: Any) -> Any:
     try:
-        info = ticker_obj.get_info()
+        value = future.result()
     except Exception:
-        info = getattr(ticker_obj, "info", {}) or {}
+        return default
+    return default if value is None else value
+
+
+def fetch_financial_data(
+    ticker_symbol: str,
+    sector_override: Optional[str] = None,
+    ticker_obj: Optional[yf.Ticker] = None,
+    price_history: Optional[pd.DataFrame] = None,
+) -> Tuple[FinancialData, List[str]]:
+    """
+    ticker_obj / price_history permettent au mode batch de fournir un Ticker
+    et un historique 5 ans déjà téléchargés.
+    """
+    if ticker_obj is None:
+        ticker_obj = get_ticker(ticker_symbol)
+    assumptions: List[str] = []
+
+    # Requêtes Yahoo indépendantes : lancées en parallèle (le GIL est relâché pendant l'I/O réseau).
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        f_info = executor.submit(ticker_obj.get_info)
+        f_cash = executor.submit(lambda: ticker_obj.cashflow)
+        f_hist = executor.submit(get_history, ticker_obj.ticker, "5y") if price_history is None else None
+        f_income = executor.submit(lambda: ticker_obj.income_stmt)
+        f_bs = executor.submit(lambda: ticker_obj.balance_sheet)
+
+    info = _result_or(f_info, None)
+    if info is None:
+        try:
+            info = getattr(ticker_obj, "info", {}) or {}
+        except Exception:
+            info = {}
+    empty = pd.DataFrame()
+    cashflow = _result_or(f_cash, empty)
+    if f_hist is not None:
+        price_history = _result_or(f_hist, empty)
+    income_stmt = _result_or(f_income, empty)
+    balance_sheet = _result_or(f_bs, empty)
 
     fast_info = getattr(ticker_obj, "fast_info", {}) or {}
     if hasattr(fast_info, "__dict__"):
@@ -389,7 +612,7 @@ def fetch_financial_data(ticker_symbol: str, sector_override: Optional[str] = No
     total_debt = info.get("totalDebt")
     total_cash = info.get("totalCash")
     net_debt = safe_first(info.get("netDebt"), (total_debt or 0) - (total_cash or 0))
-    free_cash_flow = fetch_free_cash_flow(ticker_obj)
+    free_cash_flow = fetch_free_cash_flow(cashflow)
     market_cap = safe_first(info.get("marketCap"), (price or 0) * (shares_outstanding or 0))
     dividend_rate = info.get("dividendRate")
     revenue = info.get("totalRevenue")
@@ -406,10 +629,11 @@ def fetch_financial_data(ticker_symbol: str, sector_override: Optional[str] = No
     if sector is None:
         assumptions.append("Secteur non fourni par Yahoo Finance → utilisation du profil 'Default'.")
 
-    sector_key = sector if sector in SECTOR_MULTIPLES else "Default"
-    sector_multiples = SECTOR_MULTIPLES[sector_key]
+    sector_multiples = SECTOR_MULTIPLES.get(sector, _DEFAULT_MULT)
 
-    historical_multiples = fetch_historical_multiples(ticker_obj, shares_outstanding, net_debt)
+    historical_multiples = fetch_historical_multiples(
+        price_history, income_stmt, balance_sheet, shares_outstanding, net_debt
+    )
 
     financial_data = FinancialData(
         ticker=ticker_symbol.upper(),
@@ -443,6 +667,56 @@ def fetch_financial_data(ticker_symbol: str, sector_override: Optional[str] = No
     return financial_data, assumptions
 
 
+def _history_slice(history: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
+    """Historique d'un ticker extrait du yf.download groupé ; None → téléchargement individuel."""
+    if history is None or history.empty:
+        return None
+    if isinstance(history.columns, pd.MultiIndex):
+        if symbol not in history.columns.get_level_values(0):
+            return None
+        history = history[symbol]
+    history = history.dropna(how="all")
+    return history if not history.empty else None
+
+
+def fetch_financial_data_batch(
+    symbols: List[str], sector_override: Optional[str] = None
+) -> Dict[str, Tuple[FinancialData, List[str]]]:
+    """
+    Variante multi-tickers de fetch_financial_data : un seul yf.download pour
+    les historiques 5 ans, puis les fondamentaux de chaque ticker en parallèle.
+    """
+    unique_symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+    if not unique_symbols:
+        return {}
+    try:
+        histories = yf.download(
+            unique_symbols,
+            period="5y",
+            interval="1d",
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            auto_adjust=True,
+        )
+    except Exception:
+        histories = pd.DataFrame()
+    tickers = yf.Tickers(" ".join(unique_symbols)).tickers
+
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_symbols))) as executor:
+        futures = {
+            symbol: executor.submit(
+                fetch_financial_data,
+                symbol,
+                sector_override,
+                tickers.get(symbol),
+                _history_slice(histories, symbol),
+            )
+            for symbol in unique_symbols
+        }
+    return {symbol: future.result() for symbol, future in futures.items()}
+
+
 def prompt_missing_value(
     label: str,
     current_value: Optional[float],
@@ -504,12 +778,22 @@ def safe_div(numerator: Optional[float], denominator: Optional[float]) -> Option
 
 
 def format_number(value: Optional[float], currency: bool = False, decimals: int = 2, suffix: str = "") -> str:
-    if value is None or (isinstance(value, float) and (math.isnan(value) or math.isinf(value))):
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
         return "N/A"
+    # Clé du cache : la valeur arrondie (float), plus son signe, car -0.0 == 0.0 mais s'affiche « -0.00 ».
+    rounded = round(float(value), decimals)
+    return _format_rounded(rounded, math.copysign(1.0, rounded), currency, decimals, suffix)
+
+
+@lru_cache(maxsize=4096)
+def _format_rounded(value: float, _sign: float, currency: bool, decimals: int, suffix: str) -> str:
+    # Mémoïsé : les mêmes montants (prix, devises, dividendes nuls) reviennent d'une section à l'autre.
+    if not suffix and decimals == 2:
+        # Cas le plus fréquent (calculs des ratios) : format figé, sans suffixe ni espace à retirer.
+        return f"{value:,.2f}"
+    formatted = f"{value:,.{decimals}f}"
     if currency:
-        formatted = f"{value:,.{decimals}f}"
         return f"{formatted} {suffix}".strip()
-    formatted = f"{value:,.{decimals}f}"
     return f"{formatted}{suffix}"
 
 
@@ -519,11 +803,15 @@ def format_percent(value: Optional[float], decimals: int = 1) -> str:
     return f"{value*100:.{decimals}f}%"
 
 
-def to_number(value: Optional[float]) -> Optional[float]:
+def to_number(
+    value: Optional[float],
+    _isfinite: Callable[[float], bool] = math.isfinite,
+    _numeric: Tuple[Type[float], Type[int]] = _NUMERIC_TYPES,
+) -> Optional[float]:
     if value is None:
         return None
-    if isinstance(value, (float, int)):
-        if math.isnan(value) or math.isinf(value):
+    if isinstance(value, _numeric):
+        if not _isfinite(value):
             return None
         return float(value)
     return None
@@ -551,133 +839,145 @@ def consistency_checks(data: FinancialData) -> List[str]:
     return issues
 
 
-def ratio_verdict_pe(value: Optional[float], sector_avg: Optional[float]) -> str:
-    if value is None or sector_avg is None:
-        return "Donnée insuffisante"
-    low = 0.8 * sector_avg
-    high = 1.2 * sector_avg
-    if value < low:
-        return "SOUS-ÉVALUÉ"
-    if value <= high:
-        return "NEUTRE"
-    return "SURÉVALUÉ"
-
-
-def ratio_verdict_pb(value: Optional[float]) -> str:
-    if value is None:
-        return "Donnée insuffisante"
-    if value < 1.0:
-        return "SOUS-ÉVALUÉ"
-    if value <= 3.0:
-        return "NEUTRE"
-    return "SURÉVALUÉ"
-
-
-def ratio_verdict_ps(value: Optional[float], sector_avg: Optional[float]) -> str:
-    if value is None or sector_avg is None:
-        return "Donnée insuffisante"
-    low = 0.85 * sector_avg
-    high = 1.15 * sector_avg
-    if value < low:
-        return "SOUS-ÉVALUÉ"
-    if value <= high:
-        return "NEUTRE"
-    return "SURÉVALUÉ"
-
-
-def ratio_verdict_ev_ebitda(value: Optional[float], sector_avg: Optional[float]) -> str:
-    if value is None or sector_avg is None:
-        return "Donnée insuffisante"
-    low = 0.85 * sector_avg
-    high = 1.15 * sector_avg
-    if value < low:
-        return "SOUS-ÉVALUÉ"
-    if value <= high:
-        return "NEUTRE"
-    return "SURÉVALUÉ"
-
-
-def ratio_verdict_peg(value: Optional[float]) -> str:
-    if value is None:
-        return "Donnée insuffisante"
-    if value < 1.0:
-        return "SOUS-ÉVALUÉ"
-    if abs(value - 1.0) <= 0.05:
-        return "NEUTRE"
-    return "SURÉVALUÉ"
+class Ratio(NamedTuple):
+    name: str
+    formula: str
+    calculation: str
+    value: Optional[float]
+    sector: Optional[float]
+    history: Optional[float]
+    verdict: str
+
+
+_VERDICT_LABELS = ("SOUS-ÉVALUÉ", "NEUTRE", "SURÉVALUÉ", "Donnée insuffisante")
+# Bornes par ratio, dans l'ordre P/E, P/B, P/S, EV/EBITDA, PEG : multiples de la moyenne
+# sectorielle pour P/E, P/S et EV/EBITDA, seuils absolus pour P/B et PEG.
+_VERDICT_LOW = np.array([0.8, 1.0, 0.85, 0.85, 1.0])
+_VERDICT_HIGH = np.array([1.2, 3.0, 1.15, 1.15, 1.05])
+
+
+def ratio_verdicts(
+    pe: Optional[float],
+    pb: Optional[float],
+    ps: Optional[float],
+    ev_ebitda: Optional[float],
+    peg: Optional[float],
+    sector_multiples: SectorMultiples,
+) -> List[str]:
+    """Verdicts des cinq ratios en une passe : sous le seuil bas, entre les bornes (incluse), au-dessus."""
+    values = np.array([np.nan if v is None else v for v in (pe, pb, ps, ev_ebitda, peg)], dtype=float)
+    references = np.array([sector_multiples.pe, 1.0, sector_multiples.ps, sector_multiples.ev_ebitda, 1.0], dtype=float)
+    lows = _VERDICT_LOW * references
+    highs = _VERDICT_HIGH * references
+    indices = np.where(
+        np.isnan(values) | np.isnan(references),
+        3,
+        np.where(values < lows, 0, np.where(values <= highs, 1, 2)),
+    )
+    return [_VERDICT_LABELS[index] for index in indices.tolist()]
 
 
-def compute_ratios(data: FinancialData) -> List[Dict[str, Any]]:
+def compute_ratios(data: FinancialData) -> List[Ratio]:
     sector_multiples = data.sector_multiples
     hist = data.historical_multiples
-    pe_value = safe_div(data.price, data.eps)
+    # Divisions protégées écrites en ligne (même sémantique que safe_div, sans appel de fonction).
+    price = data.price
+    pe_value = price / data.eps if price is not None and data.eps else None
     growth_percent = (data.growth_rate * 100) if data.growth_rate is not None else None
-    peg_value = safe_div(pe_value, growth_percent) if growth_percent else None
-    pb_value = safe_div(data.price, data.book_value_per_share)
-    ps_value = safe_div(data.market_cap, data.revenue) if data.market_cap and data.revenue else None
+    peg_value = pe_value / growth_percent if pe_value is not None and growth_percent else None
+    pb_value = price / data.book_value_per_share if price is not None and data.book_value_per_share else None
+    ps_value = data.market_cap / data.revenue if data.market_cap and data.revenue else None
     ebitda = data.ebitda
     enterprise_value = (data.market_cap or 0) + (data.net_debt or 0)
-    ev_ebitda_value = safe_div(enterprise_value, ebitda)
+    ev_ebitda_value = enterprise_value / ebitda if ebitda else None
+    pe_verdict, pb_verdict, ps_verdict, ev_ebitda_verdict, peg_verdict = ratio_verdicts(
+        pe_value, pb_value, ps_value, ev_ebitda_value, peg_value, sector_multiples
+    )
 
     ratios = [
-        {
-            "name": "Price to Earnings",
-            "formula": "P/E = Prix / BPA",
-            "calculation": f"{format_number(data.price, True)} / {format_number(data.eps, True)}",
-            "value": pe_value,
-            "sector": sector_multiples.get("pe"),
-            "history": hist.get("pe"),
-            "verdict": ratio_verdict_pe(pe_value, sector_multiples.get("pe")),
-        },
-        {
-            "name": "Price to Earnings Growth",
-            "formula": "PEG = P/E / Croissance (%)",
-            "calculation": f"{format_number(pe_value)} / {format_number(growth_percent, False)}",
-            "value": peg_value,
-            "sector": None,
-            "history": None,
-            "verdict": ratio_verdict_peg(peg_value),
-        },
-        {
-            "name": "Price to Book",
-            "formula": "P/B = Prix / Valeur comptable par action",
-            "calculation": f"{format_number(data.price, True)} / {format_number(data.book_value_per_share, True)}",
-            "value": pb_value,
-            "sector": sector_multiples.get("pb"),
-            "history": hist.get("pb"),
-            "verdict": ratio_verdict_pb(pb_value),
-        },
-        {
-            "name": "Price to Sales",
-            "formula": "P/S = Capitalisation / Revenu",
-            "calculation": f"{format_number(data.market_cap, True)} / {format_number(data.revenue, True)}",
-            "value": ps_value,
-            "sector": sector_multiples.get("ps"),
-            "history": hist.get("ps"),
-            "verdict": ratio_verdict_ps(ps_value, sector_multiples.get("ps")),
-        },
-        {
-            "name": "Enterprise Value / EBITDA",
-            "formula": "EV/EBITDA = Valeur d'entreprise / EBITDA",
-            "calculation": f"{format_number(enterprise_value, True)} / {format_number(ebitda, True)}",
-            "value": ev_ebitda_value,
-            "sector": sector_multiples.get("ev_ebitda"),
-            "history": hist.get("ev_ebitda"),
-            "verdict": ratio_verdict_ev_ebitda(ev_ebitda_value, sector_multiples.get("ev_ebitda")),
-        },
+        Ratio(
+            name="Price to Earnings",
+            formula="P/E = Prix / BPA",
+            calculation=f"{format_number(data.price, True)} / {format_number(data.eps, True)}",
+            value=pe_value,
+            sector=sector_multiples.pe,
+            history=hist.get("pe"),
+            verdict=pe_verdict,
+        ),
+        Ratio(
+            name="Price to Earnings Growth",
+            formula="PEG = P/E / Croissance (%)",
+            calculation=f"{format_number(pe_value)} / {format_number(growth_percent, False)}",
+            value=peg_value,
+            sector=None,
+            history=None,
+            verdict=peg_verdict,
+        ),
+        Ratio(
+            name="Price to Book",
+            formula="P/B = Prix / Valeur comptable par action",
+            calculation=f"{format_number(data.price, True)} / {format_number(data.book_value_per_share, True)}",
+            value=pb_value,
+            sector=sector_multiples.pb,
+            history=hist.get("pb"),
+            verdict=pb_verdict,
+        ),
+        Ratio(
+            name="Price to Sales",
+            formula="P/S = Capitalisation / Revenu",
+            calculation=f"{format_number(data.market_cap, True)} / {format_number(data.revenue, True)}",
+            value=ps_value,
+            sector=sector_multiples.ps,
+            history=hist.get("ps"),
+            verdict=ps_verdict,
+        ),
+        Ratio(
+            name="Enterprise Value / EBITDA",
+            formula="EV/EBITDA = Valeur d'entreprise / EBITDA",
+            calculation=f"{format_number(enterprise_value, True)} / {format_number(ebitda, True)}",
+            value=ev_ebitda_value,
+            sector=sector_multiples.ev_ebitda,
+            history=hist.get("ev_ebitda"),
+            verdict=ev_ebitda_verdict,
+        ),
     ]
     return ratios
 
 
+_DCF_YEARS = np.arange(1, 6)
+
+
+def _dcf_core(
+    fcf0: float,
+    growth_rate: float,
+    wacc: float,
+    terminal_growth: float,
+    net_debt: float,
+    shares: float,
+) -> Tuple[float, float, float, float, float, np.ndarray, np.ndarray]:
+    """DCF 5 ans en forme fermée : (EV, equity, valeur/action, PV terminale, VT, FCF, PV)."""
+    fcf_vec = fcf0 * (1 + growth_rate) ** _DCF_YEARS
+    pv_vec = fcf_vec / (1 + wacc) ** _DCF_YEARS
+    effective_terminal = min(max(terminal_growth, 0.0), wacc - 0.005)
+    terminal_value = float(fcf_vec[-1]) * (1 + effective_terminal) / (wacc - effective_terminal)
+    pv_terminal = terminal_value / ((1 + wacc) ** 5)
+    enterprise_value = pv_terminal + float(pv_vec.sum())
+    equity_value = enterprise_value - net_debt
+    intrinsic_value = equity_value / shares
+    return enterprise_value, equity_value, intrinsic_value, pv_terminal, terminal_value, fcf_vec, pv_vec
+
+
 def run_dcf(
     data: FinancialData,
     wacc: float,
     terminal_growth: float,
     growth_override: Optional[float] = None,
+    return_projections: bool = True,
 ) -> Dict[str, Any]:
     if data.free_cash_flow is None or data.free_cash_flow == 0 or data.shares_outstanding is None:
         return {
             "fcf_forecast": [],
+            "pv_array": np.empty(0),
             "pv_terminal": None,
             "intrinsic_value": None,
             "equity_value": None,
@@ -694,21 +994,21 @@ def run_dcf(
     else:
         growth_rate = data.growth_rate
         growth_source = "reported"
-    fcf = data.free_cash_flow
-    projections = []
-    for year in range(1, 6):
-        fcf = fcf * (1 + growth_rate)
-        pv = fcf / ((1 + wacc) ** year)
-        projections.append({"year": year, "fcf": fcf, "pv": pv})
-    effective_terminal = min(max(terminal_growth, 0.0), wacc - 0.005)
-    terminal_cash_flow = projections[-1]["fcf"] * (1 + effective_terminal)
-    terminal_value = terminal_cash_flow / (wacc - effective_terminal)
-    pv_terminal = terminal_value / ((1 + wacc) ** 5)
-    enterprise_value = pv_terminal + sum(row["pv"] for row in projections)
-    equity_value = enterprise_value - (data.net_debt or 0)
-    intrinsic_value = equity_value / data.shares_outstanding
+    enterprise_value, equity_value, intrinsic_value, pv_terminal, terminal_value, fcf_vec, pv_vec = _dcf_core(
+        data.free_cash_flow, growth_rate, wacc, terminal_growth, data.net_debt or 0, data.shares_outstanding
+    )
+    projections = (
+        [
+            {"year": year, "fcf": fcf, "pv": pv}
+            for year, fcf, pv in zip(_DCF_YEARS.tolist(), fcf_vec.tolist(), pv_vec.tolist())
+        ]
+        if return_projections
+        else []
+    )
     return {
         "fcf_forecast": projections,
+        # PV annuelles (float64) gardées en tableau : les réductions en aval restent en C.
+        "pv_array": pv_vec,
         "pv_terminal": pv_terminal,
         "terminal_value": terminal_value,
         "enterprise_value": enterprise_value,
@@ -723,28 +1023,40 @@ def run_dcf_scenarios(
     wacc: float,
     terminal_growth: float,
 ) -> Dict[str, Any]:
+    base_growth = data.growth_rate or 0.05
+    scenario_growth = [base_growth * scenario.growth_mult for scenario in SCENARIO_CONFIG]
+    scenario_wacc = [max(0.02, wacc + scenario.wacc_delta) for scenario in SCENARIO_CONFIG]
+    scenario_terminal = [max(0.0, terminal_growth + scenario.terminal_delta) for scenario in SCENARIO_CONFIG]
+    intrinsic_values: List[Optional[float]] = [None] * len(SCENARIO_CONFIG)
+    if data.free_cash_flow and data.shares_outstanding is not None:
+        # Les trois scénarios en un appel du noyau (mêmes calculs que run_dcf, sans projections).
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = dcf_intrinsic_kernel(
+                data.free_cash_flow,
+                data.net_debt or 0,
+                data.shares_outstanding,
+                np.array(scenario_wacc),
+                np.array(scenario_growth),
+                np.array(scenario_terminal),
+            )
+        intrinsic_values = [value if math.isfinite(value) else None for value in values.tolist()]
     scenarios_output: List[Dict[str, Optional[float]]] = []
     weighted_values: List[float] = []
-    for scenario in SCENARIO_CONFIG:
-        scenario_growth = (
-            (data.growth_rate or 0.05) * scenario["growth_mult"] if data.growth_rate is not None else 0.05 * scenario["growth_mult"]
-        )
-        scenario_wacc = max(0.02, wacc + scenario["wacc_delta"])
-        scenario_terminal = max(0.0, terminal_growth + scenario["terminal_delta"])
-        result = run_dcf(data, scenario_wacc, scenario_terminal, scenario_growth)
-        intrinsic = result.get("intrinsic_value")
+    for scenario, growth, scenario_rate, terminal, intrinsic in zip(
+        SCENARIO_CONFIG, scenario_growth, scenario_wacc, scenario_terminal, intrinsic_values
+    ):
         scenarios_output.append(
             {
-                "name": scenario["name"],
-                "wacc": scenario_wacc,
-                "growth_rate": scenario_growth,
-                "terminal_growth": scenario_terminal,
+                "name": scenario.name,
+                "wacc": scenario_rate,
+                "growth_rate": growth,
+                "terminal_growth": terminal,
                 "intrinsic_value": intrinsic,
-                "weight": scenario["weight"],
+                "weight": scenario.weight,
             }
         )
         if intrinsic:
-            weighted_values.append(intrinsic * scenario["weight"])
+            weighted_values.append(intrinsic * scenario.weight)
     weighted_intrinsic = sum(weighted_values) if weighted_values else None
     return {"scenarios": scenarios_output, "weighted_intrinsic_value": weighted_intrinsic}
 
@@ -754,209 +1066,184 @@ def run_monte_carlo(
     base_wacc: float,
     base_growth: float,
     iterations: int = 150,
+    seed: Optional[int] = None,
 ) -> Dict[str, Optional[float]]:
+    """seed fige les tirages (reproductibilité) ; sinon le générateur partagé du module est utilisé."""
     if data.free_cash_flow is None or data.shares_outstanding is None:
         return {"iterations": 0, "median": None, "min": None, "max": None}
-    values: List[float] = []
-    for _ in range(iterations):
-        random_wacc = max(0.02, random.gauss(base_wacc, 0.01))
-        random_growth = max(0.0, random.gauss(base_growth, 0.02))
-        random_terminal = max(0.0, random_growth / 2)
-        result = run_dcf(data, random_wacc, random_terminal, random_growth)
-        intrinsic = result.get("intrinsic_value")
-        if intrinsic:
-            values.append(intrinsic)
-    if not values:
+    if not data.free_cash_flow:
+        return {"iterations": iterations, "median": None, "min": None, "max": None}
+    # Tirages NumPy, puis tous les DCF évalués d'un coup par le noyau : un tirage par ligne.
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+    random_wacc = np.maximum(0.02, rng.normal(base_wacc, 0.01, iterations))
+    random_growth = np.maximum(0.0, rng.normal(base_growth, 0.02, iterations))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intrinsic = monte_carlo_kernel(
+            data.free_cash_flow, data.net_debt or 0, data.shares_outstanding, random_wacc, random_growth, random_growth / 2
+        )
+    values = intrinsic[np.isfinite(intrinsic) & (intrinsic != 0)]
+    if not values.size:
         return {"iterations": iterations, "median": None, "min": None, "max": None}
     return {
         "iterations": iterations,
-        "median": statistics.median(values),
-        "min": min(values),
-        "max": max(values),
+        "median": float(np.median(values)),
+        "min": float(values.min()),
+        "max": float(values.max()),
     }
 
 
-def score_health(data: FinancialData) -> float:
-    if data.equity and data.equity != 0 and data.net_debt is not None:
-        debt_to_equity = data.net_debt / data.equity
-    else:
-        debt_to_equity = None
-    score = 70.0
-    if debt_to_equity is not None:
-        if debt_to_equity < 0:
-            score = 90.0
-        elif debt_to_equity < 0.2:
-            score = 80.0
-        elif debt_to_equity < 0.5:
-            score = 70.0
-        elif debt_to_equity < 1:
-            score = 55.0
-        else:
-            score = 40.0
-    if data.payout_ratio is not None:
-        if data.payout_ratio < 0.5:
-            score += 5
-        elif data.payout_ratio > 0.9:
-            score -= 10
-    return max(0, min(100, score))
+# Champs numériques de FinancialData regroupés en un enregistrement float64 (NaN = absent) ;
+# un tableau structuré de N lignes sert de SoA pour les calculs par lot.
+RECORD_FIELDS = (
+    "price",
+    "eps",
+    "growth_rate",
+    "book_value_per_share",
+    "shares_outstanding",
+    "equity",
+    "total_debt",
+    "total_cash",
+    "net_debt",
+    "free_cash_flow",
+    "market_cap",
+    "dividend",
+    "revenue",
+    "net_income",
+    "ebitda",
+    "roe",
+    "roa",
+    "payout_ratio",
+    "beta",
+)
+RECORD_DTYPE = np.dtype([(name, "f8") for name in RECORD_FIELDS])
+
+
+def to_record(items: List[FinancialData]) -> np.ndarray:
+    """Tableau structuré (RECORD_DTYPE), une ligne par ticker."""
+    rows = [
+        tuple(math.nan if (value := getattr(item, name)) is None else value for name in RECORD_FIELDS)
+        for item in items
+    ]
+    return np.array(rows, dtype=RECORD_DTYPE)
 
 
-def score_growth(data: FinancialData) -> float:
-    growth = data.growth_rate
-    if growth is None:
-        return 50.0
-    if growth >= 0.2:
-        return 90.0
-    if growth >= 0.1:
-        return 75.0
-    if growth >= 0.05:
-        return 60.0
-    if growth >= 0.0:
-        return 45.0
-    return 30.0
-
-
-def score_valuation(ratios: List[Dict[str, Any]]) -> float:
-    mapping = {"SOUS-ÉVALUÉ": 90, "NEUTRE": 60, "SURÉVALUÉ": 30}
-    collected = []
-    for ratio in ratios:
-        verdict = ratio["verdict"]
-        if verdict in mapping:
-            collected.append(mapping[verdict])
-    if not collected:
-        return 50.0
-    return float(np.mean(collected))
+def _health_scores(equity: np.ndarray, net_debt: np.ndarray, payout_ratio: np.ndarray) -> np.ndarray:
+    has_leverage = np.isfinite(equity) & (equity != 0) & np.isfinite(net_debt)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        debt_to_equity = net_debt / equity
+    score = np.select(
+        [~has_leverage, debt_to_equity < 0, debt_to_equity < 0.2, debt_to_equity < 0.5, debt_to_equity < 1],
+        [70.0, 90.0, 80.0, 70.0, 55.0],
+        default=40.0,
+    )
+    score = score + np.select([payout_ratio < 0.5, payout_ratio > 0.9], [5.0, -10.0], default=0.0)
+    return np.clip(score, 0, 100)
 
 
-def score_risk(data: FinancialData) -> float:
-    beta = data.beta or 1.0
-    if beta < 0.8:
-        score = 85.0
-    elif beta < 1.1:
-        score = 70.0
-    elif beta < 1.5:
-        score = 55.0
+def _growth_scores(growth: np.ndarray) -> np.ndarray:
+    return np.select(
+        [np.isnan(growth), growth >= 0.2, growth >= 0.1, growth >= 0.05, growth >= 0.0],
+        [50.0, 90.0, 75.0, 60.0, 45.0],
+        default=30.0,
+    )
+
+
+def _risk_scores(beta: np.ndarray, net_debt: np.ndarray, ebitda: np.ndarray) -> np.ndarray:
+    beta = np.where(np.isnan(beta) | (beta == 0), 1.0, beta)
+    score = np.select([beta < 0.8, beta < 1.1, beta < 1.5], [85.0, 70.0, 55.0], default=40.0)
+    has_leverage = np.isfinite(net_debt) & (net_debt != 0) & np.isfinite(ebitda) & (ebitda != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        leverage = net_debt / ebitda
+    score = score + np.select([has_leverage & (leverage < 1), has_leverage & (leverage > 3)], [5.0, -10.0], default=0.0)
+    return np.clip(score, 0, 100)
+
+
+def score_batch(records: np.ndarray, valuation: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Scores de N tickers en une passe vectorielle sur un tableau structuré (to_record).
+    valuation : scores de valorisation déjà calculés (50 par défaut, NaN compris).
+    """
+    health = _health_scores(records["equity"], records["net_debt"], records["payout_ratio"])
+    growth = _growth_scores(records["growth_rate"])
+    risk = _risk_scores(records["beta"], records["net_debt"], records["ebitda"])
+    if valuation is None:
+        valuation_scores = np.full(len(records), 50.0)
     else:
-        score = 40.0
-    if data.net_debt and data.ebitda:
-        leverage = data.net_debt / data.ebitda
-        if leverage < 1:
-            score += 5
-        elif leverage > 3:
-            score -= 10
-    return max(0, min(100, score))
+        valuation_scores = np.asarray(valuation, dtype=float)
+        valuation_scores = np.where(np.isnan(valuation_scores), 50.0, valuation_scores)
+    overall = 0.25 * (health + growth + valuation_scores + risk)
+    return {"santé": health, "croissance": growth, "valorisation": valuation_scores, "risque": risk, "score_total": overall}
 
 
-def aggregate_scores(
-    data: FinancialData, ratios: List[Dict[str, Any]]
-) -> Dict[str, float]:
-    health = score_health(data)
-    growth = score_growth(data)
-    valuation = score_valuation(ratios)
-    risk = score_risk(data)
-    overall = 0.25 * (health + growth + valuation + risk)
-    return {"santé": health, "croissance": growth, "valorisation": valuation, "risque": risk, "score_total": overall}
+def score_health(data: FinancialData) -> float:
+    record = to_record([data])
+    return float(_health_scores(record["equity"], record["net_debt"], record["payout_ratio"])[0])
 
 
-def compute_roic(data: FinancialData) -> Optional[float]:
-    if data.net_income is None:
-        return None
-    invested_capital = None
-    if data.equity is not None and data.total_debt is not None:
-        invested_capital = data.equity + data.total_debt - (data.total_cash or 0)
-    if invested_capital and invested_capital != 0:
-        return data.net_income / invested_capital
-    return None
+def score_growth(data: FinancialData) -> float:
+    return float(_growth_scores(to_record([data])["growth_rate"])[0])
 
 
-def compute_fcf_yield(data: FinancialData) -> Optional[float]:
-    if data.free_cash_flow is None or not data.market_cap:
-        return None
-    return data.free_cash_flow / data.market_cap
+_VALUATION_POINTS = MappingProxyType({"SOUS-ÉVALUÉ": 90, "NEUTRE": 60, "SURÉVALUÉ": 30})
 
 
-def compute_operating_margin(data: FinancialData) -> Optional[float]:
-    if data.net_income is None or data.revenue is None or data.revenue == 0:
-        return None
-    return data.net_income / data.revenue
-
-
-def compute_piotroski_score(data: FinancialData, roic: Optional[float], fcf_yield: Optional[float]) -> Optional[int]:
-    score = 0
-    metrics_available = False
-    if data.net_income is not None:
-        metrics_available = True
-        if data.net_income > 0:
-            score += 1
-    if data.free_cash_flow is not None:
-        metrics_available = True
-        if data.free_cash_flow > 0:
-            score += 1
-    if data.growth_rate is not None:
-        metrics_available = True
-        if data.growth_rate > 0:
-            score += 1
-    if data.net_debt is not None:
-        metrics_available = True
-        if data.net_debt <= 0:
-            score += 1
-    if data.payout_ratio is not None:
-        metrics_available = True
-        if 0 < data.payout_ratio < 0.7:
-            score += 1
-    if data.roe is not None and data.roe > 0.15:
-        metrics_available = True
-        score += 1
-    if roic is not None and roic > 0.1:
-        score += 1
-    if fcf_yield is not None and fcf_yield > 0.05:
-        score += 1
-    margin = compute_operating_margin(data)
-    if margin is not None and margin > 0.1:
-        score += 1
-    return score if metrics_available else None
-
-
-def compute_z_score(data: FinancialData) -> Optional[float]:
-    equity = data.equity or 0
-    total_debt = data.total_debt or 0
-    assets = equity + total_debt
-    if assets <= 0:
-        return None
-    working_capital = (data.total_cash or 0) - max(data.net_debt or 0, 0)
-    retained_earnings = data.net_income or 0
-    ebit = (data.ebitda or data.net_income or 0) * 0.8
-    market_value_equity = data.market_cap or 0
-    revenue = data.revenue or 0
-    liabilities = total_debt if total_debt > 0 else 1.0
-    z = (
-        1.2 * (working_capital / assets)
-        + 1.4 * (retained_earnings / assets)
-        + 3.3 * (ebit / assets)
-        + 0.6 * (market_value_equity / liabilities)
-        + 1.0 * (revenue / assets)
+def score_valuation(ratios: List[Ratio]) -> float:
+    points = _VALUATION_POINTS
+    collected = [points[ratio.verdict] for ratio in ratios if ratio.verdict in points]
+    if not collected:
+        return 50.0
+    # Cinq ratios au plus : une moyenne Python évite l'aller-retour vers un tableau numpy.
+    return sum(collected) / len(collected)
+
+
+def score_risk(data: FinancialData) -> float:
+    record = to_record([data])
+    return float(_risk_scores(record["beta"], record["net_debt"], record["ebitda"])[0])
+
+
+def aggregate_scores(
+    data: FinancialData, ratios: List[Ratio]
+) -> Dict[str, float]:
+    scores = score_batch(to_record([data]), np.array([score_valuation(ratios)]))
+    return {name: float(values[0]) for name, values in scores.items()}
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def compute_advanced_metrics_batch(records: np.ndarray) -> Dict[str, np.ndarray]:
+    """Métriques avancées colonne par colonne sur un tableau structuré (NaN = indisponible)."""
+    metrics = advanced_kernel_batch(
+        records["net_income"],
+        records["equity"],
+        records["total_debt"],
+        records["total_cash"],
+        records["free_cash_flow"],
+        records["market_cap"],
+        records["revenue"],
+        records["growth_rate"],
+        records["net_debt"],
+        records["payout_ratio"],
+        records["roe"],
+        records["ebitda"],
     )
-    return z
+    return dict(zip(("roic", "fcf_yield", "operating_margin", "piotroski_score", "z_score"), metrics.T))
 
 
 def compute_advanced_metrics(data: FinancialData) -> Dict[str, Optional[float]]:
-    roic = compute_roic(data)
-    fcf_yield = compute_fcf_yield(data)
-    margin = compute_operating_margin(data)
-    piotroski = compute_piotroski_score(data, roic, fcf_yield)
-    z_score = compute_z_score(data)
+    metrics = {name: float(values[0]) for name, values in compute_advanced_metrics_batch(to_record([data])).items()}
+    piotroski = metrics["piotroski_score"]
     return {
-        "roic": roic,
-        "fcf_yield": fcf_yield,
-        "operating_margin": margin,
-        "piotroski_score": piotroski,
-        "z_score": z_score,
+        "roic": _none_if_nan(metrics["roic"]),
+        "fcf_yield": _none_if_nan(metrics["fcf_yield"]),
+        "operating_margin": _none_if_nan(metrics["operating_margin"]),
+        "piotroski_score": None if math.isnan(piotroski) else int(piotroski),
+        "z_score": _none_if_nan(metrics["z_score"]),
     }
 
 
-def build_key_data_section(data: FinancialData, consistency: List[str]) -> Dict[str, Any]:
-    notes = consistency.copy()
-    required_fields = [
+_KEY_DATA_FIELDS = (
         ("price", "Prix actuel"),
         ("eps", "Bénéfice par action"),
         ("revenue", "Revenu"),
@@ -967,58 +1254,67 @@ def build_key_data_section(data: FinancialData, consistency: List[str]) -> Dict[
         ("roe", "Return on Equity"),
         ("roa", "Return on Assets"),
         ("payout_ratio", "Payout ratio"),
-    ]
-    for attr, label in required_fields:
-        if to_number(getattr(data, attr)) is None:
-            notes.append(f"{label} manquant")
+)
+_KEY_DATA_GETTER = operator.attrgetter(*(attr for attr, _ in _KEY_DATA_FIELDS))
+
+
+def build_key_data_section(data: FinancialData, consistency: List[str]) -> Dict[str, Any]:
+    # Une seule lecture des champs (attrgetter en C), convertis une fois pour les notes et la sortie.
+    values = [to_number(value) for value in _KEY_DATA_GETTER(data)]
+    price, eps, revenue, net_income, free_cash_flow, _net_debt, growth_rate, roe, roa, payout_ratio = values
+    notes = consistency.copy()
+    notes.extend(f"{label} manquant" for (_, label), value in zip(_KEY_DATA_FIELDS, values) if value is None)
     margin = safe_div(data.net_income, data.revenue)
+    multiples = data.sector_multiples
     return {
-        "prix_actuel": to_number(data.price),
-        "EPS": to_number(data.eps),
-        "revenu": to_number(data.revenue),
-        "benefice_net": to_number(data.net_income),
-        "FCF": to_number(data.free_cash_flow),
+        "prix_actuel": price,
+        "EPS": eps,
+        "revenu": revenue,
+        "benefice_net": net_income,
+        "FCF": free_cash_flow,
         "dette": to_number(data.net_debt if data.net_debt is not None else data.total_debt),
-        "croissance": to_number(data.growth_rate),
+        "croissance": growth_rate,
         "marge": to_number(margin),
-        "ROE": to_number(data.roe),
-        "ROA": to_number(data.roa),
-        "payout_ratio": to_number(data.payout_ratio),
+        "ROE": roe,
+        "ROA": roa,
+        "payout_ratio": payout_ratio,
         "sector_multiples": {
-            "PE": to_number(data.sector_multiples.get("pe")),
-            "PB": to_number(data.sector_multiples.get("pb")),
-            "EV_EBITDA": to_number(data.sector_multiples.get("ev_ebitda")),
-            "PS": to_number(data.sector_multiples.get("ps")),
+            "PE": to_number(multiples.pe),
+            "PB": to_number(multiples.pb),
+            "EV_EBITDA": to_number(multiples.ev_ebitda),
+            "PS": to_number(multiples.ps),
         },
         "notes": notes,
     }
 
 
-def build_multiples_section(ratios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def build_multiples_section(ratios: List[Ratio]) -> List[Dict[str, Any]]:
     formatted: List[Dict[str, Any]] = []
     for ratio in ratios:
         formatted.append(
             {
-                "ratio": ratio["name"],
-                "formula": ratio.get("formula"),
-                "calculation": ratio.get("calculation"),
-                "value": to_number(ratio["value"]),
-                "sector": to_number(ratio["sector"]),
-                "historic_5y": to_number(ratio["history"]),
-                "verdict": ratio["verdict"],
+                "ratio": ratio.name,
+                "formula": ratio.formula,
+                "calculation": ratio.calculation,
+                "value": to_number(ratio.value),
+                "sector": to_number(ratio.sector),
+                "historic_5y": to_number(ratio.history),
+                "verdict": ratio.verdict,
             }
         )
     return formatted
 
 
+_PRICE_GAP_TEMPLATE = "Action {direction} de {gap:.1f}%"
+
+
 def describe_price_gap(price: Optional[float], intrinsic: Optional[float]) -> str:
     if price is None or intrinsic is None:
         return "Comparaison impossible (données manquantes)"
     gap = (price - intrinsic) / intrinsic
     if abs(gap) < 0.01:
         return "Prix aligné sur la valeur intrinsèque"
-    direction = "surévaluée" if gap > 0 else "sous-évaluée"
-    return f"Action {direction} de {abs(gap)*100:.1f}%"
+    return _PRICE_GAP_TEMPLATE.format(direction="surévaluée" if gap > 0 else "sous-évaluée", gap=abs(gap) * 100)
 
 
 def build_dcf_section(
@@ -1042,7 +1338,7 @@ def build_dcf_section(
             "comparaison": "Calcul de valeur intrinsèque indisponible",
             "notes": notes,
         }
-    pv_sum = sum(row["pv"] for row in dcf["fcf_forecast"])
+    pv_sum = float(dcf["pv_array"].sum())
     intrinsic = dcf.get("intrinsic_value")
     comparaison = describe_price_gap(data.price, intrinsic)
     return {
@@ -1082,42 +1378,49 @@ def build_recommandation_section(
     }
 
 
-def build_catalysts(
+def build_narrative(
     data: FinancialData,
     scores: Dict[str, float],
     dcf: Dict[str, Any],
-    ratios: List[Dict[str, Any]],
-) -> List[str]:
+    ratios: List[Ratio],
+) -> Tuple[List[str], List[str]]:
+    """Principaux risques et catalyseurs (4 au plus chacun), en une lecture des champs partagés."""
+    growth = data.growth_rate
+    free_cash_flow = data.free_cash_flow
+    net_debt = data.net_debt
+    ebitda = data.ebitda
+
+    risks: List[str] = []
+    if growth is None or growth < 0.03:
+        risks.append("Visibilité limitée sur la croissance des revenus (<3 % ou inconnue)")
+    if net_debt and ebitda and ebitda > 0 and net_debt / ebitda > 3:
+        risks.append("Levier financier élevé (Dette nette / EBITDA > 3x)")
+    if free_cash_flow is None or free_cash_flow < 0:
+        risks.append("Free Cash Flow fragile ou négatif")
+    if scores["risque"] < 50:
+        risks.append("Beta et volatilité supérieurs aux pairs (profil risque élevé)")
+    risks.append("Sensibilité aux cycles macroéconomiques et à la réglementation du secteur")
+
     catalysts: List[str] = []
-    if data.growth_rate and data.growth_rate > 0.1:
+    if growth and growth > 0.1:
         catalysts.append("Fort potentiel de croissance organique (>10 % annuel)")
-    if data.free_cash_flow and data.free_cash_flow > 0 and (data.dividend or 0) > 0:
+    if free_cash_flow and free_cash_flow > 0 and (data.dividend or 0) > 0:
         catalysts.append("Distribution de cash attractive (dividendes ou rachats)")
     if scores["valorisation"] >= 70:
         catalysts.append("Multiples attractifs vs. secteur (valorisation sous la moyenne)")
-    if data.net_debt is not None and data.net_debt < 0:
+    if net_debt is not None and net_debt < 0:
         catalysts.append("Bilan net cash permettant des acquisitions opportunistes")
     catalysts.append("Initiatives stratégiques : innovation produit, expansion géographique ou gains de marge")
-    return catalysts[:4]
+    return risks[:4], catalysts[:4]
 
 
-def build_risk_points(
-    data: FinancialData,
-    scores: Dict[str, float],
-    dcf: Dict[str, Any],
-    ratios: List[Dict[str, Any]],
-) -> List[str]:
-    risks: List[str] = []
-    if data.growth_rate is None or data.growth_rate < 0.03:
-        risks.append("Visibilité limitée sur la croissance des revenus (<3 % ou inconnue)")
-    if data.net_debt and data.ebitda and data.ebitda > 0 and data.net_debt / data.ebitda > 3:
-        risks.append("Levier financier élevé (Dette nette / EBITDA > 3x)")
-    if data.free_cash_flow is None or data.free_cash_flow < 0:
-        risks.append("Free Cash Flow fragile ou négatif")
-    if scores["risque"] < 50:
-        risks.append("Beta et volatilité supérieurs aux pairs (profil risque élevé)")
-    risks.append("Sensibilité aux cycles macroéconomiques et à la réglementation du secteur")
-    return risks[:4]
+_VERDICT_TEMPLATES = MappingProxyType(
+    {
+        "under": "Prix ({price}) inférieur de {gap:.1f}% à la valeur intrinsèque estimée ({intrinsic}).",
+        "over": "Prix supérieur de {gap:.1f}% à la valeur intrinsèque estimée ({intrinsic}).",
+        "fair": "Prix proche de la valeur intrinsèque (écart {gap:.1f}%).",
+    }
+)
 
 
 def derive_verdict(price: Optional[float], intrinsic: Optional[float], score: float) -> Tuple[str, str]:
@@ -1130,31 +1433,35 @@ def derive_verdict(price: Optional[float], intrinsic: Optional[float], score: fl
     discount = (price - intrinsic) / intrinsic
     if discount <= -0.15:
         verdict = "🟢 Sous-évaluée"
-        reason = f"Prix ({format_number(price, True)}) inférieur de {abs(discount)*100:.1f}% à la valeur intrinsèque estimée ({format_number(intrinsic, True)})."
+        reason = _VERDICT_TEMPLATES["under"].format(
+            price=format_number(price, True), gap=abs(discount) * 100, intrinsic=format_number(intrinsic, True)
+        )
     elif discount >= 0.15:
         verdict = "🔴 Surévaluée"
-        reason = f"Prix supérieur de {discount*100:.1f}% à la valeur intrinsèque estimée ({format_number(intrinsic, True)})."
+        reason = _VERDICT_TEMPLATES["over"].format(gap=discount * 100, intrinsic=format_number(intrinsic, True))
     else:
         verdict = "⚪ Neutre"
-        reason = f"Prix proche de la valeur intrinsèque (écart {discount*100:.1f}%)."
+        reason = _VERDICT_TEMPLATES["fair"].format(gap=discount * 100)
     return verdict, reason
 
 
-def build_investor_summary(data: FinancialData, ratios: List[Dict[str, Any]], dcf: Dict[str, Any]) -> List[str]:
+def build_investor_summary(
+    data: FinancialData, ratio_by_name: Mapping[str, Ratio], dcf: Dict[str, Any]
+) -> List[str]:
     lines: List[str] = []
     lines.append(f"{data.name} ({data.ticker}) - secteur {data.sector or 'N/A'} / industrie {data.industry or 'N/A'}.")
     lines.append(f"Prix actuel : {format_number(data.price, True, decimals=2, suffix=data.currency or '')}.")
     lines.append(
         f"Croissance attendue : {format_percent(data.growth_rate)} ; Return on Equity : {format_percent(data.roe)}."
     )
-    pe_ratio = next((r for r in ratios if r["name"] == "Price to Earnings"), None)
+    pe_ratio = ratio_by_name.get("Price to Earnings")
     if pe_ratio:
         lines.append(
-            f"Price to Earnings actuel {format_number(pe_ratio['value'])} vs secteur {format_number(pe_ratio['sector'])}."
+            f"Price to Earnings actuel {format_number(pe_ratio.value)} vs secteur {format_number(pe_ratio.sector)}."
         )
-    ps_ratio = next((r for r in ratios if r["name"] == "Price to Sales"), None)
+    ps_ratio = ratio_by_name.get("Price to Sales")
     if ps_ratio:
-        lines.append(f"Price to Sales {format_number(ps_ratio['value'])} (secteur {format_number(ps_ratio['sector'])}).")
+        lines.append(f"Price to Sales {format_number(ps_ratio.value)} (secteur {format_number(ps_ratio.sector)}).")
     lines.append(
         f"Free Cash Flow utilisé pour le Discounted Cash Flow : {format_number(data.free_cash_flow, True, decimals=0, suffix=data.currency or '')}."
     )
@@ -1199,6 +1506,9 @@ def apply_overrides_to_data(data: FinancialData, overrides: Optional[Dict[str, f
             assumptions.append(f"{label} forcé à {value}.")
 
 
+PipelineResult = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
 def run_analysis_pipeline(
     ticker: str,
     wacc: float,
@@ -1206,7 +1516,62 @@ def run_analysis_pipeline(
     sector_override: Optional[str] = None,
     allow_prompts: bool = True,
     overrides: Optional[Dict[str, float]] = None,
-) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+) -> PipelineResult:
+    """
+    Analyse complète. Sans saisie interactive, le résultat est mémorisé en processus pendant
+    TICKER_CACHE_TTL secondes pour les mêmes paramètres ; chaque appel en reçoit une copie profonde.
+    """
+    if (allow_prompts and not BATCH_MODE) or TICKER_CACHE_TTL <= 0:
+        return _run_analysis_pipeline(ticker, wacc, terminal_growth, sector_override, allow_prompts, overrides)
+    frozen_overrides = tuple(sorted(overrides.items())) if overrides else ()
+    bucket = _cache_bucket()
+    _roll_pipeline_cache(bucket)
+    result = _cached_pipeline(ticker, wacc, terminal_growth, sector_override, frozen_overrides, bucket)
+    # L'appelant peut modifier payload et contexte sans altérer l'entrée mémorisée.
+    return copy.deepcopy(result)
+
+
+_pipeline_bucket: Optional[int] = None
+_pipeline_bucket_lock = threading.Lock()
+
+
+def _roll_pipeline_cache(bucket: int) -> None:
+    # Les entrées d'une fenêtre TTL passée ne peuvent plus être relues : on les libère toutes.
+    global _pipeline_bucket
+    if bucket == _pipeline_bucket:
+        return
+    with _pipeline_bucket_lock:
+        if bucket != _pipeline_bucket:
+            _cached_pipeline.cache_clear()
+            _pipeline_bucket = bucket
+
+
+@lru_cache(maxsize=256)
+def _cached_pipeline(
+    ticker: str,
+    wacc: float,
+    terminal_growth: float,
+    sector_override: Optional[str],
+    frozen_overrides: Tuple[Tuple[str, float], ...],
+    bucket: int,
+) -> PipelineResult:
+    return _run_analysis_pipeline(
+        ticker, wacc, terminal_growth, sector_override, False, dict(frozen_overrides) or None
+    )
+
+
+def clear_pipeline_cache() -> None:
+    _cached_pipeline.cache_clear()
+
+
+def _run_analysis_pipeline(
+    ticker: str,
+    wacc: float,
+    terminal_growth: float,
+    sector_override: Optional[str],
+    allow_prompts: bool,
+    overrides: Optional[Dict[str, float]],
+) -> PipelineResult:
     normalized_ticker = ticker.strip().upper()
     data, assumptions = fetch_financial_data(normalized_ticker, sector_override)
     if not has_core_data(data):
@@ -1220,32 +1585,41 @@ def run_analysis_pipeline(
             )
             assumptions.append(note)
     apply_overrides_to_data(data, overrides, assumptions)
-    fill_critical_gaps(data, no_prompt=not allow_prompts, assumptions=assumptions)
+    if allow_prompts and not BATCH_MODE:
+        fill_critical_gaps(data, no_prompt=False, assumptions=assumptions)
+
+    # Historiques et news partent en parallèle pendant les calculs (DCF, Monte Carlo, scores).
+    executor = io_executor()
+    f_prices = executor.submit(fetch_price_history, data.ticker)
+    f_benchmark = executor.submit(fetch_market_history, "SPY")
+    f_vix = executor.submit(fetch_market_history, "^VIX", period="6mo", interval="1wk")
+    f_news = executor.submit(fetch_company_news, data.ticker)
 
     ratio_results = compute_ratios(data)
+    ratio_by_name = {ratio.name: ratio for ratio in ratio_results}
     dcf = run_dcf(data, wacc, terminal_growth)
     scenario_block = run_dcf_scenarios(data, wacc, terminal_growth)
     monte_carlo = run_monte_carlo(data, wacc, data.growth_rate or 0.05)
     advanced_metrics = compute_advanced_metrics(data)
     scores = aggregate_scores(data, ratio_results)
     verdict, verdict_reason = derive_verdict(data.price, dcf.get("intrinsic_value"), scores["score_total"])
-    summary_lines = build_investor_summary(data, ratio_results, dcf)
+    summary_lines = build_investor_summary(data, ratio_by_name, dcf)
     rec_action, rec_horizon = recommendation_action(verdict, scores["score_total"])
-    price_history = fetch_price_history(data.ticker)
-    benchmark_history = fetch_price_history("SPY")
+    price_history = _result_or(f_prices, [])
+    benchmark_history = _result_or(f_benchmark, [])
     benchmark_ticker = "SPY" if benchmark_history else None
     if not benchmark_history:
-        alt_history = fetch_price_history("^GSPC")
+        alt_history = fetch_market_history("^GSPC")
         if alt_history:
             benchmark_history = alt_history
             benchmark_ticker = "^GSPC"
-    vix_history = fetch_price_history("^VIX", period="6mo", interval="1wk")
+    vix_history = _result_or(f_vix, [])
     vix_level = vix_history[-1]["close"] if vix_history else None
     macro_risk = {
         "vix": vix_level,
         "level": "elevated" if vix_level and vix_level > 20 else ("high" if vix_level and vix_level > 30 else "moderate"),
     }
-    news = fetch_company_news(data.ticker)
+    news = _result_or(f_news, [])
 
     checks = consistency_checks(data)
     key_data_section = build_key_data_section(data, checks)
@@ -1260,8 +1634,7 @@ def run_analysis_pipeline(
     }
     verdict_section = build_verdict_section(verdict, verdict_reason)
     resume_text = build_resume(summary_lines)
-    risk_points = build_risk_points(data, scores, dcf, ratio_results)
-    catalysts = build_catalysts(data, scores, dcf, ratio_results)
+    risk_points, catalysts = build_narrative(data, scores, dcf, ratio_results)
     recommandation_section = build_recommandation_section(rec_action, rec_horizon, risk_points, catalysts)
 
     payload = {
@@ -1310,12 +1683,24 @@ def run_analysis_pipeline(
     return payload, context
 
 
+def to_pretty_json(payload: Dict[str, Any]) -> str:
+    """JSON indenté pour la CLI : orjson (sortie UTF-8 directe) si disponible, sinon la stdlib."""
+    if orjson is not None:
+        return orjson.dumps(
+            payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
 def main() -> None:
+    global DISK_CACHE_ENABLED
     args = parse_args()
+    if args.no_cache:
+        DISK_CACHE_ENABLED = False
     ticker = args.ticker.strip().upper()
     if not ticker:
         error_payload = {"ticker": args.ticker, "erreur": "Ticker non reconnu ou introuvable dans la base de données."}
-        print(json.dumps(error_payload, ensure_ascii=False, indent=2))
+        print(to_pretty_json(error_payload))
         return
     try:
         payload, _ = run_analysis_pipeline(
@@ -1327,10 +1712,10 @@ def main() -> None:
         )
     except Exception as exc:
         error_payload = {"ticker": ticker, "erreur": f"Impossible de récupérer les données ({exc})."}
-        print(json.dumps(error_payload, ensure_ascii=False, indent=2))
+        print(to_pretty_json(error_payload))
         return
 
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print(to_pretty_json(payload))
 
 
 if __name__ == "__main__":
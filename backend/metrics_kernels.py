@@ -0,0 +1,266 @@
+"""
+Noyaux numériques : métriques avancées (ROIC, FCF yield, marge, Piotroski, Z-Score) et
+valorisation DCF vectorielle (scénarios, Monte Carlo).
+Toutes les entrées sont des float64, NaN servant de sentinelle « donnée absente » ;
+compilés en nopython par numba s'il est installé, exécutés en Python pur / NumPy sinon.
+Les tirages aléatoires restent côté appelant (Generator NumPy) et sont passés en tableaux.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba est optionnel
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        if args and callable(args[0]):
+            return args[0]
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            return func
+
+        return decorator
+
+
+@njit(cache=True)
+def _or_zero(value: float) -> float:
+    # Équivalent de `value or 0` pour une valeur absente (NaN) ou nulle.
+    return 0.0 if math.isnan(value) else value
+
+
+@njit(cache=True)
+def advanced_kernel(
+    net_income: float,
+    equity: float,
+    total_debt: float,
+    total_cash: float,
+    free_cash_flow: float,
+    market_cap: float,
+    revenue: float,
+    growth_rate: float,
+    net_debt: float,
+    payout_ratio: float,
+    roe: float,
+    ebitda: float,
+) -> Tuple[float, float, float, float, float]:
+    """Retourne (roic, fcf_yield, marge, piotroski, z_score) ; NaN quand la métrique est indisponible."""
+    nan = math.nan
+
+    roic = nan
+    if not math.isnan(net_income) and not math.isnan(equity) and not math.isnan(total_debt):
+        invested_capital = equity + total_debt - _or_zero(total_cash)
+        if invested_capital != 0:
+            roic = net_income / invested_capital
+
+    fcf_yield = nan
+    if not math.isnan(free_cash_flow) and not math.isnan(market_cap) and market_cap != 0:
+        fcf_yield = free_cash_flow / market_cap
+
+    margin = nan
+    if not math.isnan(net_income) and not math.isnan(revenue) and revenue != 0:
+        margin = net_income / revenue
+
+    score = 0
+    metrics_available = False
+    if not math.isnan(net_income):
+        metrics_available = True
+        if net_income > 0:
+            score += 1
+    if not math.isnan(free_cash_flow):
+        metrics_available = True
+        if free_cash_flow > 0:
+            score += 1
+    if not math.isnan(growth_rate):
+        metrics_available = True
+        if growth_rate > 0:
+            score += 1
+    if not math.isnan(net_debt):
+        metrics_available = True
+        if net_debt <= 0:
+            score += 1
+    if not math.isnan(payout_ratio):
+        metrics_available = True
+        if 0 < payout_ratio < 0.7:
+            score += 1
+    if roe > 0.15:
+        metrics_available = True
+        score += 1
+    if roic > 0.1:
+        score += 1
+    if fcf_yield > 0.05:
+        score += 1
+    if margin > 0.1:
+        score += 1
+    piotroski = float(score) if metrics_available else nan
+
+    z_score = nan
+    debt = _or_zero(total_debt)
+    assets = _or_zero(equity) + debt
+    if assets > 0:
+        working_capital = _or_zero(total_cash) - max(_or_zero(net_debt), 0.0)
+        retained_earnings = _or_zero(net_income)
+        if not math.isnan(ebitda) and ebitda != 0:
+            ebit = ebitda * 0.8
+        else:
+            ebit = _or_zero(net_income) * 0.8
+        liabilities = debt if debt > 0 else 1.0
+        z_score = (
+            1.2 * (working_capital / assets)
+            + 1.4 * (retained_earnings / assets)
+            + 3.3 * (ebit / assets)
+            + 0.6 * (_or_zero(market_cap) / liabilities)
+            + 1.0 * (_or_zero(revenue) / assets)
+        )
+
+    return roic, fcf_yield, margin, piotroski, z_score
+
+
+@njit(cache=True)
+def advanced_kernel_batch(
+    net_income: np.ndarray,
+    equity: np.ndarray,
+    total_debt: np.ndarray,
+    total_cash: np.ndarray,
+    free_cash_flow: np.ndarray,
+    market_cap: np.ndarray,
+    revenue: np.ndarray,
+    growth_rate: np.ndarray,
+    net_debt: np.ndarray,
+    payout_ratio: np.ndarray,
+    roe: np.ndarray,
+    ebitda: np.ndarray,
+) -> np.ndarray:
+    """advanced_kernel ligne par ligne sur des colonnes float64 ; retourne un tableau (n, 5)."""
+    size = net_income.shape[0]
+    out = np.empty((size, 5))
+    for i in range(size):
+        out[i, 0], out[i, 1], out[i, 2], out[i, 3], out[i, 4] = advanced_kernel(
+            net_income[i],
+            equity[i],
+            total_debt[i],
+            total_cash[i],
+            free_cash_flow[i],
+            market_cap[i],
+            revenue[i],
+            growth_rate[i],
+            net_debt[i],
+            payout_ratio[i],
+            roe[i],
+            ebitda[i],
+        )
+    return out
+
+
+@njit(cache=True)
+def dcf_intrinsic_kernel(
+    fcf0: float,
+    net_debt: float,
+    shares: float,
+    wacc: np.ndarray,
+    growth: np.ndarray,
+    terminal: np.ndarray,
+) -> np.ndarray:
+    """Valeur intrinsèque par action d'un DCF 5 ans + valeur terminale, une ligne par jeu d'hypothèses."""
+    years = np.arange(1.0, 6.0)
+    fcf = fcf0 * (1 + growth)[:, None] ** years
+    pv = fcf / (1 + wacc)[:, None] ** years
+    effective_terminal = np.minimum(np.maximum(terminal, 0.0), wacc - 0.005)
+    terminal_value = fcf[:, -1] * (1 + effective_terminal) / (wacc - effective_terminal)
+    pv_terminal = terminal_value / (1 + wacc) ** 5
+    return (pv.sum(axis=1) + pv_terminal - net_debt) / shares
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _dcf_intrinsic_parallel(
+    fcf0: float,
+    net_debt: float,
+    shares: float,
+    wacc: np.ndarray,
+    growth: np.ndarray,
+    terminal: np.ndarray,
+) -> np.ndarray:
+    # Même calcul que dcf_intrinsic_kernel, une ligne (tirage) par itération de prange.
+    size = wacc.shape[0]
+    out = np.empty(size)
+    for i in prange(size):
+        rate = wacc[i]
+        fcf = fcf0
+        discount = 1.0
+        pv_sum = 0.0
+        for _year in range(5):
+            fcf *= 1 + growth[i]
+            discount *= 1 + rate
+            pv_sum += fcf / discount
+        effective_terminal = min(max(terminal[i], 0.0), rate - 0.005)
+        terminal_value = fcf * (1 + effective_terminal) / (rate - effective_terminal)
+        out[i] = (pv_sum + terminal_value / discount - net_debt) / shares
+    return out
+
+
+def monte_carlo_kernel(
+    fcf0: float,
+    net_debt: float,
+    shares: float,
+    wacc: np.ndarray,
+    growth: np.ndarray,
+    terminal: np.ndarray,
+) -> np.ndarray:
+    """
+    Valeurs intrinsèques des tirages Monte Carlo (tirages pré-générés par l'appelant).
+    Avec numba, les tirages sont répartis sur tous les cœurs (prange, fastmath : écarts de
+    l'ordre de l'ulp) ; sans numba, la version vectorielle NumPy est plus rapide qu'une boucle.
+    """
+    if NUMBA_AVAILABLE:
+        return _dcf_intrinsic_parallel(fcf0, net_debt, shares, wacc, growth, terminal)
+    return dcf_intrinsic_kernel(fcf0, net_debt, shares, wacc, growth, terminal)
+
+
+# Codes des opérateurs d'alerte (colonne numérique des stores) ; -1 = inconnu, jamais déclenché.
+ALERT_OPERATORS = {">": 0, ">=": 1, "<": 2, "<=": 3}
+
+
+@njit(parallel=True, cache=True)
+def _alert_mask_parallel(thresholds: np.ndarray, operators: np.ndarray, values: np.ndarray) -> np.ndarray:
+    size = thresholds.shape[0]
+    out = np.zeros(size, dtype=np.bool_)
+    for i in prange(size):
+        value = values[i]
+        threshold = thresholds[i]
+        operator = operators[i]
+        out[i] = (
+            (operator == 0 and value > threshold)
+            or (operator == 1 and value >= threshold)
+            or (operator == 2 and value < threshold)
+            or (operator == 3 and value <= threshold)
+        )
+    return out
+
+
+def alert_mask(thresholds: np.ndarray, operators: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Masque des alertes déclenchées ; une valeur NaN (métrique absente) ne déclenche rien."""
+    if NUMBA_AVAILABLE:
+        return _alert_mask_parallel(thresholds, operators, values)
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [operators == 0, operators == 1, operators == 2, operators == 3],
+            [values > thresholds, values >= thresholds, values < thresholds, values <= thresholds],
+            False,
+        )
+
+
+def warm_up() -> None:
+    """Déclenche la compilation (ou le chargement du cache numba) avant la première analyse."""
+    one = np.ones(1)
+    advanced_kernel_batch(one, one, one, one, one, one, one, one * 0.1, one * 0.0, one * 0.3, one * 0.2, one)
+    dcf_intrinsic_kernel(1.0, 0.0, 1.0, one * 0.08, one * 0.05, one * 0.025)
+    monte_carlo_kernel(1.0, 0.0, 1.0, one * 0.08, one * 0.05, one * 0.025)
+    alert_mask(one, one * 0.0, one)
@@ -6,6 +6,9 @@ from typing import AsyncIterator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.app import shutdown_io
+from backend.metrics_kernels import warm_up
+from backend.server.responses import FastJSONResponse
 from backend.server.routes import alerts, analysis, portfolio
 from backend.server.settings import Settings, get_settings
 from backend.server.stores import AlertStore, PortfolioStore, ResultCache
@@ -27,19 +30,29 @@ def configure_cors(app: FastAPI, settings: Settings) -> None:
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     settings = get_settings()
     app.state.settings = settings
-    app.state.result_cache = ResultCache(ttl=settings.cache_ttl)
+    cache_dir = settings.data_dir / "cache" if settings.cache_on_disk else None
+    app.state.result_cache = ResultCache(
+        ttl=settings.cache_ttl, disk_dir=cache_dir, max_size=settings.cache_max_entries
+    )
     settings.data_dir.mkdir(parents=True, exist_ok=True)
-    portfolio_path = settings.data_dir / "portfolio.json"
-    alerts_path = settings.data_dir / "alerts.json"
+    # Journal NDJSON (.json) par défaut, base SQLite (.db) avec ANALYZER_STORE_BACKEND=sqlite.
+    suffix = ".db" if settings.store_backend == "sqlite" else ".json"
+    portfolio_path = settings.data_dir / f"portfolio{suffix}"
+    alerts_path = settings.data_dir / f"alerts{suffix}"
     app.state.portfolio_store = PortfolioStore(portfolio_path)
     app.state.alert_store = AlertStore(alerts_path)
+    # Compile (ou recharge depuis le cache numba) le noyau des métriques avant la première requête.
+    warm_up()
     yield
-    # No teardown logic for now; stores live with the app instance.
+    # Écritures différées des stores encore en attente, puis arrêt du pool réseau.
+    app.state.portfolio_store.flush()
+    app.state.alert_store.flush()
+    shutdown_io()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
-    application = FastAPI(title=settings.app_name, lifespan=lifespan)
+    application = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=FastJSONResponse)
     configure_cors(application, settings)
     application.include_router(analysis.router)
     application.include_router(portfolio.router)
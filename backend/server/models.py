@@ -1,57 +1,63 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import sys
+from typing import Annotated, Dict, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field, field_validator
 
 from backend.app import DEFAULT_TERMINAL_GROWTH, DEFAULT_WACC
 
 
+def _normalize_ticker(value: str) -> str:
+    cleaned = value.upper()
+    if not cleaned:
+        raise ValueError("Ticker requis")
+    # Internée : les clés de cache et les lignes des stores partagent la même chaîne.
+    return sys.intern(cleaned)
+
+
+# Un seul validateur partagé : le core-schema du ticker est réutilisé par les trois modèles.
+TickerStr = Annotated[str, AfterValidator(_normalize_ticker)]
+
+
+def _empty_if_none(value: object) -> object:
+    return "" if value is None else value
+
+
+# Note facultative : "" (et non None) signifie « pas de note », null reste accepté en entrée.
+NoteStr = Annotated[str, BeforeValidator(_empty_if_none)]
+
+# DTO d'entrée : immuables, champs inconnus ignorés, espaces retirés avant validation.
+REQUEST_CONFIG = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
+
 class AnalysisRequest(BaseModel):
-    ticker: str = Field(..., description="Ticker Yahoo Finance (ex: AAPL)")
+    model_config = REQUEST_CONFIG
+
+    ticker: TickerStr = Field(..., description="Ticker Yahoo Finance (ex: AAPL)")
     wacc: float = Field(DEFAULT_WACC, description="WACC (décimal, 0.08 = 8 %)")
     terminalGrowth: float = Field(DEFAULT_TERMINAL_GROWTH, description="Croissance terminale (décimal)")
     sector: Optional[str] = Field(None, description="Secteur forcé")
     overrides: Optional[Dict[str, float]] = Field(None, description="Valeurs manuelles (prix, EPS, etc.)")
 
-    @field_validator("ticker")
-    @classmethod
-    def normalize_ticker(cls, value: str) -> str:
-        cleaned = (value or "").strip().upper()
-        if not cleaned:
-            raise ValueError("Ticker requis")
-        return cleaned
-
 
 class PortfolioRequest(BaseModel):
-    ticker: str
+    model_config = REQUEST_CONFIG
+
+    ticker: TickerStr
     quantity: float = Field(..., gt=0)
     price: float = Field(..., gt=0)
-    note: Optional[str] = None
-
-    @field_validator("ticker")
-    @classmethod
-    def normalize_portfolio_ticker(cls, value: str) -> str:
-        cleaned = (value or "").strip().upper()
-        if not cleaned:
-            raise ValueError("Ticker requis")
-        return cleaned
+    note: NoteStr = ""
 
 
 class AlertRequest(BaseModel):
-    ticker: str
+    model_config = REQUEST_CONFIG
+
+    ticker: TickerStr
     metric: str
     operator: str = Field(..., description=">, <, >= ou <=")
     threshold: float
-    note: Optional[str] = None
-
-    @field_validator("ticker")
-    @classmethod
-    def normalize_alert_ticker(cls, value: str) -> str:
-        cleaned = (value or "").strip().upper()
-        if not cleaned:
-            raise ValueError("Ticker requis")
-        return cleaned
+    note: NoteStr = ""
 
     @field_validator("operator")
     @classmethod
@@ -60,3 +66,10 @@ class AlertRequest(BaseModel):
         if value not in allowed:
             raise ValueError("Opérateur invalide")
         return value
+
+
+class AlertEvaluationRequest(BaseModel):
+    model_config = REQUEST_CONFIG
+
+    ticker: TickerStr
+    values: Dict[str, float] = Field(..., description="Valeurs courantes par métrique (ex: prix, ecart_dcf)")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None  # type: ignore[assignment]
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Réponse JSON encodée par orjson (scalaires numpy et clés non-str acceptés).
+    Équivalent local de l'ORJSONResponse de FastAPI, dépréciée dans les versions récentes ;
+    retombe sur l'encodeur Starlette si orjson n'est pas installé (dataclasses converties
+    au préalable par jsonable_encoder, orjson les sérialisant nativement).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
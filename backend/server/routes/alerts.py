@@ -1,26 +1,26 @@
 from __future__ import annotations
 
 import time
-from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from backend.server.dependencies import get_alert_store
-from backend.server.models import AlertRequest
+from backend.server.models import AlertEvaluationRequest, AlertRequest
 from backend.server.stores import AlertItem, AlertStore
+from backend.server.utils import fast_id
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
 
 @router.get("")
-def list_alerts(store: AlertStore = Depends(get_alert_store)):
-    return {"alerts": store.list_alerts()}
+def list_alerts(store: AlertStore = Depends(get_alert_store)) -> Response:
+    return Response(content=store.list_alerts_json(), media_type="application/json")
 
 
 @router.post("")
 def create_alert(payload: AlertRequest, store: AlertStore = Depends(get_alert_store)):
     alert = AlertItem(
-        id=str(uuid4()),
+        id=fast_id(),
         ticker=payload.ticker,
         metric=payload.metric,
         operator=payload.operator,
@@ -31,6 +31,11 @@ def create_alert(payload: AlertRequest, store: AlertStore = Depends(get_alert_st
     return store.add_alert(alert)
 
 
+@router.post("/evaluate")
+def evaluate_alerts(payload: AlertEvaluationRequest, store: AlertStore = Depends(get_alert_store)):
+    return {"triggered": store.evaluate(payload.ticker, payload.values)}
+
+
 @router.delete("/{alert_id}")
 def delete_alert(alert_id: str, store: AlertStore = Depends(get_alert_store)):
     deleted = store.delete_alert(alert_id)
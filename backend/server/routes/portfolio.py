@@ -1,20 +1,21 @@
 from __future__ import annotations
 
 import time
-from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from backend.server.dependencies import get_portfolio_store
 from backend.server.models import PortfolioRequest
 from backend.server.stores import PortfolioItem, PortfolioStore
+from backend.server.utils import fast_id
 
 router = APIRouter(prefix="/portfolio", tags=["portfolio"])
 
 
 @router.get("")
-def list_portfolio(store: PortfolioStore = Depends(get_portfolio_store)):
-    return {"positions": store.list_positions()}
+def list_portfolio(store: PortfolioStore = Depends(get_portfolio_store)) -> Response:
+    # Octets mis en cache par le store : ni reconstruction ni sérialisation entre deux mutations.
+    return Response(content=store.list_positions_json(), media_type="application/json")
 
 
 @router.post("")
@@ -23,7 +24,7 @@ def create_position(
     store: PortfolioStore = Depends(get_portfolio_store),
 ):
     item = PortfolioItem(
-        id=str(uuid4()),
+        id=fast_id(),
         ticker=payload.ticker,
         quantity=payload.quantity,
         price=payload.price,
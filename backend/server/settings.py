@@ -12,12 +12,15 @@ class Settings:
 
     app_name: str = os.getenv("ANALYZER_APP_NAME", "Financial Analyzer API")
     cache_ttl: int = int(os.getenv("ANALYZER_CACHE_TTL", "600"))
+    cache_max_entries: int = int(os.getenv("ANALYZER_CACHE_MAX_ENTRIES", "512"))
+    cache_on_disk: bool = os.getenv("ANALYZER_CACHE_ON_DISK", "0") not in ("", "0")
     cors_allow_origins: tuple[str, ...] = tuple(
         origin.strip()
         for origin in os.getenv("ANALYZER_ALLOW_ORIGINS", "").split(",")
         if origin.strip()
     )
     data_dir: Path = Path(os.getenv("ANALYZER_DATA_DIR", "./storage")).resolve()
+    store_backend: str = os.getenv("ANALYZER_STORE_BACKEND", "json").strip().lower()
 
 
 @lru_cache(maxsize=1)
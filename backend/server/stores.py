@@ -1,42 +1,479 @@
 from __future__ import annotations
 
-import time
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import mmap
+import os
+import sqlite3
+import sys
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, is_dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from backend.metrics_kernels import ALERT_OPERATORS, alert_mask
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None  # type: ignore[assignment]
+
+
+def _json_default(value: Any) -> Any:
+    # Équivalent stdlib de la sérialisation native des dataclasses par orjson.
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON UTF-8 ; orjson (dataclasses et scalaires numpy natifs) si disponible, sinon la stdlib."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Rend le renommage lui-même durable (entrée de répertoire) ; sans objet hors POSIX.
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, data: bytes, tmp_path: Optional[Path] = None, durable: bool = True) -> None:
+    """
+    Écrit data dans un fichier temporaire puis le renomme : le fichier cible n'est jamais tronqué.
+    durable : fsync du temporaire avant le renommage puis du répertoire, pour qu'un arrêt brutal
+    ne laisse jamais un fichier renommé mais vide (inutile pour un simple cache).
+    """
+    tmp_path = tmp_path or path.with_suffix(".tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durable:
+        _fsync_directory(path.parent)
+
+
+class Journal:
+    """
+    Journal NDJSON append-only d'un store : une ligne {"op": "add", "item": ...} ou
+    {"op": "del", "id": ...} par mutation, soit O(1) octets écrits au lieu du fichier entier.
+    Compacté (réécriture atomique de l'état courant) dès qu'il dépasse deux fois le nombre
+    d'éléments vivants. Les fsync sont regroupés par un minuteur ; flush() force le dernier.
+    """
+
+    COMPACT_MIN_RECORDS = 64
+
+    def __init__(self, path: Path, sync_delay: float = 0.05) -> None:
+        self._path = path
+        self._sync_delay = sync_delay
+        self._lock = threading.Lock()
+        self._handle: Optional[BinaryIO] = None
+        self._timer: Optional[threading.Timer] = None
+        self._records = 0
+        # Ancien tableau JSON ou dernière ligne tronquée : à réécrire avant tout append.
+        self.needs_rewrite = False
+
+    def replay(self) -> List[Any]:
+        # Fichier projeté en mémoire (mmap) : lu depuis le cache de pages, sans copie intégrale.
+        try:
+            with open(self._path, "rb") as handle:
+                if not os.fstat(handle.fileno()).st_size:
+                    return []
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self._replay_mapped(mapped)
+        except OSError:
+            return []
+
+    def _replay_mapped(self, mapped: mmap.mmap) -> List[Any]:
+        if mapped[:64].lstrip().startswith(b"["):
+            # Ancien format (tableau JSON complet), migré par la première compaction.
+            self.needs_rewrite = True
+            try:
+                # orjson lit directement la projection ; json exige des bytes.
+                if orjson is not None:
+                    with memoryview(mapped) as view:
+                        entries = orjson.loads(view)
+                else:
+                    entries = json.loads(mapped[:])
+            except ValueError:
+                return []
+            return [{"op": "add", "item": entry} for entry in entries]
+        self.needs_rewrite = mapped[-1:] != b"\n"
+        records = []
+        for line in iter(mapped.readline, b""):
+            if line.isspace():
+                continue
+            try:
+                records.append(loads(line))
+            except ValueError:  # ligne tronquée par un arrêt brutal pendant un append
+                continue
+        self._records = len(records)
+        return records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = dumps(record) + b"\n"
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self._path, "ab")
+            self._handle.write(line)
+            self._handle.flush()
+            self._records += 1
+            if self._timer is None:
+                self._timer = threading.Timer(self._sync_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def should_compact(self, live: int) -> bool:
+        return self.needs_rewrite or self._records > max(self.COMPACT_MIN_RECORDS, 2 * live)
+
+    def compact(self, snapshot: Callable[[], List[Dict[str, Any]]]) -> None:
+        # snapshot() est lu sous le verrou : un append concurrent le précède (déjà dans l'état)
+        # ou le suit (écrit dans le nouveau fichier) ; rejouer un "add" en double est sans effet.
+        with self._lock:
+            records = snapshot()
+            write_atomic(self._path, b"".join(dumps(record) + b"\n" for record in records))
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._records = len(records)
+            self.needs_rewrite = False
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._handle is not None:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+
+
+class SqliteJournal:
+    """
+    Variante SQLite de Journal, même interface : une table par store, une ligne par élément
+    (INSERT OR REPLACE / DELETE), WAL + synchronous=NORMAL. Chaque mutation est une transaction
+    atomique : ni compaction ni fsync différé à gérer.
+    """
+
+    def __init__(self, path: Path, table: str, columns: Tuple[str, ...]) -> None:
+        self._lock = threading.Lock()
+        self._columns = columns
+        self._get_columns = attrgetter(*columns)
+        names = ", ".join(columns)
+        self._select = f"SELECT {names} FROM {table} ORDER BY rowid"
+        self._insert = f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({', '.join('?' * len(columns))})"
+        self._delete = f"DELETE FROM {table} WHERE {columns[0]} = ?"
+        # Autocommit (isolation_level=None) ; accès sérialisés par _lock entre threads.
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ({columns[0]} TEXT PRIMARY KEY, {', '.join(columns[1:])})"
+        )
+
+    def replay(self) -> List[Any]:
+        with self._lock:
+            rows = self._connection.execute(self._select).fetchall()
+        columns = self._columns
+        return [{"op": "add", "item": dict(zip(columns, row))} for row in rows]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if record["op"] == "del":
+                self._connection.execute(self._delete, (record["id"],))
+            else:
+                self._connection.execute(self._insert, self._get_columns(record["item"]))
+
+    def should_compact(self, live: int) -> bool:
+        return False
+
+    def compact(self, snapshot: Callable[[], List[Dict[str, Any]]]) -> None:
+        pass
+
+    def flush(self) -> None:
+        # synchronous=NORMAL : le WAL est rendu durable au checkpoint.
+        with self._lock:
+            self._connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+StoreJournal = Union[Journal, SqliteJournal]
+
+
+def open_journal(path: Path, table: str, columns: Tuple[str, ...]) -> StoreJournal:
+    """Journal SQLite pour un fichier .db / .sqlite, journal NDJSON sinon."""
+    if path.suffix in (".db", ".sqlite"):
+        return SqliteJournal(path, table, columns)
+    return Journal(path)
 
 
 @dataclass(slots=True)
 class CacheEntry:
     payload: Dict[str, Any]
-    timestamp: float
+    expires_at_ns: int  # échéance sur l'horloge monotone du processus, en nanosecondes
 
 
 class ResultCache:
-    def __init__(self, ttl: int) -> None:
+    """
+    Cache TTL des analyses, réparti sur SHARDS dictionnaires : la lecture ne prend aucun verrou
+    (dict.get est atomique), l'écriture ne verrouille que le shard concerné.
+    Chaque shard tient un tas (échéance, n°, clé) : store() purge au passage les entrées expirées,
+    y compris celles qui ne sont plus jamais relues.
+    Chaque shard est aussi un LRU borné à max_size / SHARDS entrées (OrderedDict, éviction O(1)).
+    Les échéances sont des entiers time.monotonic_ns() : comparaison entière, insensible aux
+    sauts de l'horloge murale (NTP).
+    Avec disk_dir, chaque entrée est aussi écrite en JSON pour survivre à un redémarrage
+    (horodatage mur, l'horloge monotone ne survivant pas au processus). Un fichier expiré est
+    supprimé dès qu'une lecture le trouve périmé ; le répertoire est élagué à l'ouverture puis
+    toutes les max_size écritures (expirés d'abord, puis les plus anciens au-delà de max_size).
+    """
+
+    SHARDS = 16
+
+    def __init__(self, ttl: int, disk_dir: Optional[Path] = None, max_size: int = 512) -> None:
         self.ttl = ttl
-        self._entries: Dict[str, CacheEntry] = {}
+        self._ttl_ns = int(ttl * 1_000_000_000)
+        self._shard_size = max(1, -(-max_size // self.SHARDS))
+        self._shards: List[OrderedDict[Hashable, CacheEntry]] = [OrderedDict() for _ in range(self.SHARDS)]
+        self._heaps: List[List[Tuple[int, int, Hashable]]] = [[] for _ in range(self.SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.SHARDS)]
+        self._sequence = itertools.count()
+        self._max_size = max_size
+        self._disk_dir = disk_dir
+        self._disk_lock = threading.Lock()
+        self._disk_writes = 0
+        if self._disk_dir:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self.prune_disk()
 
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
+    def _index(self, key: Hashable) -> int:
+        return hash(key) % self.SHARDS
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
         if self.ttl <= 0:
             return None
-        entry = self._entries.get(key)
+        index = self._index(key)
+        entry = self._shards[index].get(key)
+        if entry is None and self._disk_dir:
+            entry = self._load_entry(self._disk_dir, key)
+            if entry is not None:
+                with self._locks[index]:
+                    self._insert(index, key, entry)
         if not entry:
             return None
-        if time.time() - entry.timestamp > self.ttl:
-            self._entries.pop(key, None)
+        if entry.expires_at_ns <= time.monotonic_ns():
+            with self._locks[index]:
+                if self._shards[index].get(key) is entry:
+                    del self._shards[index][key]
+            if self._disk_dir:
+                self._disk_path(self._disk_dir, key).unlink(missing_ok=True)
             return None
+        try:
+            # OrderedDict est implémenté en C : move_to_end est atomique sous le GIL, sans verrou.
+            self._shards[index].move_to_end(key)
+        except KeyError:  # évincée entre-temps par un store concurrent
+            pass
         return entry.payload
 
-    def store(self, key: str, payload: Dict[str, Any]) -> None:
+    def store(self, key: Hashable, payload: Dict[str, Any]) -> None:
         if self.ttl <= 0:
             return
-        self._entries[key] = CacheEntry(payload=payload, timestamp=time.time())
+        now = time.monotonic_ns()
+        entry = CacheEntry(payload=payload, expires_at_ns=now + self._ttl_ns)
+        index = self._index(key)
+        with self._locks[index]:
+            self._purge(index, now)
+            self._insert(index, key, entry)
+        if self._disk_dir:
+            self._save_entry(self._disk_dir, key, entry)
 
     def clear(self) -> None:
-        self._entries.clear()
+        for shard, heap, lock in zip(self._shards, self._heaps, self._locks):
+            with lock:
+                shard.clear()
+                heap.clear()
+
+    def _insert(self, index: int, key: Hashable, entry: CacheEntry) -> None:
+        # Appelé sous le verrou du shard.
+        shard = self._shards[index]
+        shard[key] = entry
+        shard.move_to_end(key)
+        while len(shard) > self._shard_size:
+            shard.popitem(last=False)  # son item de tas est ignoré à la purge (clé absente)
+        heap = self._heaps[index]
+        heapq.heappush(heap, (entry.expires_at_ns, next(self._sequence), key))
+        if len(heap) > 4 * self._shard_size:
+            # Trop d'items orphelins (clés évincées ou réécrites) : tas reconstruit depuis le shard.
+            heap[:] = [(item.expires_at_ns, next(self._sequence), name) for name, item in shard.items()]
+            heapq.heapify(heap)
+
+    def _purge(self, index: int, now: int) -> None:
+        # Appelé sous le verrou du shard ; une clé réécrite depuis garde son entrée plus récente.
+        shard = self._shards[index]
+        heap = self._heaps[index]
+        while heap and heap[0][0] <= now:
+            _expires_at, _, key = heapq.heappop(heap)
+            entry = shard.get(key)
+            if entry is not None and entry.expires_at_ns <= now:
+                del shard[key]
+
+    @staticmethod
+    def _disk_path(directory: Path, key: Hashable) -> Path:
+        # hash() varie d'un processus à l'autre : le nom de fichier repose sur un condensat stable.
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+        return directory / f"{digest}.json"
+
+    def _load_entry(self, directory: Path, key: Hashable) -> Optional[CacheEntry]:
+        path = self._disk_path(directory, key)
+        try:
+            raw = loads(path.read_bytes())
+            remaining_ns = self._ttl_ns - (time.time_ns() - int(float(raw["timestamp"]) * 1_000_000_000))
+            if remaining_ns > 0:
+                return CacheEntry(payload=raw["payload"], expires_at_ns=time.monotonic_ns() + remaining_ns)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        # Périmé ou illisible : inutile de le relire au prochain appel.
+        path.unlink(missing_ok=True)
+        return None
+
+    def _save_entry(self, directory: Path, key: Hashable, entry: CacheEntry) -> None:
+        path = self._disk_path(directory, key)
+        tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+        try:
+            elapsed_ns = self._ttl_ns - (entry.expires_at_ns - time.monotonic_ns())
+            timestamp = (time.time_ns() - elapsed_ns) / 1_000_000_000
+            write_atomic(path, dumps({"timestamp": timestamp, "payload": entry.payload}), tmp_path, durable=False)
+        except (OSError, TypeError, ValueError):  # orjson.JSONEncodeError hérite de TypeError
+            return
+        with self._disk_lock:
+            self._disk_writes += 1
+            due = self._disk_writes >= self._max_size
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self) -> None:
+        """Supprime les fichiers expirés (mtime = écriture) puis les plus anciens au-delà de max_size."""
+        if not self._disk_dir:
+            return
+        with self._disk_lock:
+            self._disk_writes = 0
+            cutoff = time.time() - self.ttl
+            alive: List[Tuple[float, Path]] = []
+            for path in self._disk_dir.iterdir():
+                if path.suffix not in (".json", ".tmp"):
+                    continue
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+                if mtime <= cutoff:
+                    # Entrée expirée, ou .tmp abandonné par une écriture interrompue.
+                    path.unlink(missing_ok=True)
+                elif path.suffix == ".json":
+                    alive.append((mtime, path))
+            if len(alive) > self._max_size:
+                alive.sort()
+                for _mtime, path in alive[: len(alive) - self._max_size]:
+                    path.unlink(missing_ok=True)
+
+
+class ColumnTable:
+    """
+    Table en colonnes (SoA) : colonnes numériques en float64 contigus, colonnes texte en listes.
+    id → ligne en O(1) ; une ligne supprimée est remise à zéro et réutilisée (liste libre), de sorte
+    que les réductions (np.dot, masques) portent sur tout le tableau sans filtrage.
+    Les appelants sérialisent les accès avec leur propre verrou.
+    """
+
+    def __init__(self, float_columns: Tuple[str, ...], object_columns: Tuple[str, ...], capacity: int = 64) -> None:
+        self.rows: Dict[str, int] = {}  # ordre d'insertion des ids conservé (ordre de listing)
+        self.floats: Dict[str, np.ndarray] = {name: np.zeros(capacity) for name in float_columns}
+        self.objects: Dict[str, List[Any]] = {name: [None] * capacity for name in object_columns}
+        self._free: List[int] = []
+        self._allocated = 0
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def put(self, key: str, values: Dict[str, Any]) -> int:
+        row = self.rows.get(key)
+        if row is None:
+            row = self._free.pop() if self._free else self._next_row()
+            self.rows[key] = row
+        for name, column in self.floats.items():
+            column[row] = values[name]
+        for name, objects in self.objects.items():
+            objects[row] = values[name]
+        return row
+
+    def remove(self, key: str) -> bool:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return False
+        for column in self.floats.values():
+            column[row] = 0.0
+        for objects in self.objects.values():
+            objects[row] = None
+        self._free.append(row)
+        return True
+
+    def live_rows(self) -> np.ndarray:
+        return np.fromiter(self.rows.values(), dtype=np.intp, count=len(self.rows))
+
+    def _next_row(self) -> int:
+        if self._allocated == self._capacity:
+            self._capacity *= 2
+            for name, column in self.floats.items():
+                grown = np.zeros(self._capacity)
+                grown[: column.size] = column
+                self.floats[name] = grown
+            for objects in self.objects.values():
+                objects.extend([None] * (self._capacity - len(objects)))
+        row = self._allocated
+        self._allocated += 1
+        return row
+
+
+def _as_float(value: Any) -> float:
+    # Nombres JSON déjà décodés : aucun appel ; float() seulement pour les chaînes héritées ("3").
+    if type(value) is float or type(value) is int:
+        return value
+    return float(value)  # TypeError / ValueError : entrée rejetée par l'appelant
 
 
 @dataclass(slots=True)
@@ -45,77 +482,139 @@ class PortfolioItem:
     ticker: str
     quantity: float
     price: float
-    note: Optional[str]
+    note: str  # "" quand il n'y a pas de note
     timestamp: float
+    # Calculée une fois à la création (les positions ne sont jamais modifiées en place).
+    value: float = field(init=False)
 
-    @property
-    def value(self) -> float:
-        return self.quantity * self.price
+    def __post_init__(self) -> None:
+        self.value = self.quantity * self.price
 
 
 class PortfolioStore:
+    """Positions stockées en colonnes : la valeur totale est une seule réduction sur la colonne value."""
+
+    _FLOATS = ("quantity", "price", "value", "timestamp")
+    _OBJECTS = ("id", "ticker", "note")
+    _PERSISTED = ("id", "ticker", "quantity", "price", "note", "timestamp")
+
     def __init__(self, storage_path: Optional[Path] = None) -> None:
-        self._items: Dict[str, PortfolioItem] = {}
+        self._table = ColumnTable(self._FLOATS, self._OBJECTS)
+        # Réentrant : une mutation journalise sous ce verrou (même ordre en mémoire et sur
+        # disque), et la compaction qu'elle déclenche relit l'état via list_*().
+        self._lock = threading.RLock()
+        # Corps JSON de GET /portfolio, reconstruit seulement après une mutation.
+        self._listing_json: Optional[bytes] = None
         self._storage_path = storage_path
+        self._journal: Optional[StoreJournal] = None
         if self._storage_path:
             self._storage_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open_journal(self._storage_path, "portfolio", self._PERSISTED)
             self._load_from_disk()
 
-    def list_positions(self) -> List[Dict[str, Any]]:
-        return [self._serialize(item) for item in self._items.values()]
+    def list_positions(self) -> List[PortfolioItem]:
+        """Positions en dataclasses à slots (plus légères qu'un dict par ligne, sérialisées telles quelles)."""
+        with self._lock:
+            table = self._table
+            rows = table.live_rows()
+            floats = table.floats
+            columns = (
+                [table.objects["id"][row] for row in rows],
+                [table.objects["ticker"][row] for row in rows],
+                floats["quantity"][rows].tolist(),
+                floats["price"][rows].tolist(),
+                [table.objects["note"][row] for row in rows],
+                floats["timestamp"][rows].tolist(),
+            )
+        return [PortfolioItem(*values) for values in zip(*columns)]
+
+    def total_value(self) -> float:
+        with self._lock:
+            # Les lignes libres sont à zéro : inutile de filtrer.
+            return float(self._table.floats["value"].sum())
 
-    def add_position(self, item: PortfolioItem) -> Dict[str, Any]:
-        self._items[item.id] = item
-        payload = self._serialize(item)
-        self._persist()
-        return payload
+    def list_positions_json(self) -> bytes:
+        """{"positions": [...], "total_value": ...} déjà sérialisé, mis en cache jusqu'à la prochaine mutation."""
+        with self._lock:
+            if self._listing_json is None:
+                self._listing_json = dumps({"positions": self.list_positions(), "total_value": self.total_value()})
+            return self._listing_json
+
+    def add_position(self, item: PortfolioItem) -> PortfolioItem:
+        with self._lock:
+            self._put(item)
+            self._listing_json = None
+            self._log({"op": "add", "item": item})
+        return item
 
     def delete_position(self, item_id: str) -> bool:
-        deleted = self._items.pop(item_id, None) is not None
-        if deleted:
-            self._persist()
+        with self._lock:
+            deleted = self._table.remove(item_id)
+            if deleted:
+                self._listing_json = None
+                self._log({"op": "del", "id": item_id})
         return deleted
 
-    @staticmethod
-    def _serialize(item: PortfolioItem) -> Dict[str, Any]:
-        return {
-            "id": item.id,
-            "ticker": item.ticker,
-            "quantity": item.quantity,
-            "price": item.price,
-            "value": item.value,
-            "note": item.note,
-            "timestamp": item.timestamp,
-        }
+    def _put(self, item: PortfolioItem) -> None:
+        # Tickers internés : une seule chaîne partagée par toutes les lignes d'un même titre.
+        self._table.put(
+            item.id,
+            {
+                "id": item.id,
+                "ticker": sys.intern(item.ticker),
+                "quantity": item.quantity,
+                "price": item.price,
+                "value": item.value,
+                "note": item.note,
+                "timestamp": item.timestamp,
+            },
+        )
 
     def _load_from_disk(self) -> None:
-        if not self._storage_path or not self._storage_path.exists():
-            return
-        try:
-            data = json.loads(self._storage_path.read_text(encoding="utf-8") or "[]")
-        except (json.JSONDecodeError, OSError):
+        if not self._journal:
             return
-        for entry in data:
+        for record in self._journal.replay():
+            if not isinstance(record, dict):
+                continue
+            if record.get("op") == "del":
+                item_id = record.get("id")
+                if isinstance(item_id, str):
+                    self._table.remove(item_id)
+                continue
+            entry = record.get("item")
+            if not isinstance(entry, dict):
+                continue
+            # Une entrée mal formée est ignorée seule, sans bloquer le chargement du store.
             try:
                 item = PortfolioItem(
                     id=entry["id"],
                     ticker=entry["ticker"],
-                    quantity=float(entry["quantity"]),
-                    price=float(entry["price"]),
-                    note=entry.get("note"),
-                    timestamp=float(entry["timestamp"]),
+                    quantity=_as_float(entry["quantity"]),
+                    price=_as_float(entry["price"]),
+                    note=entry.get("note") or "",
+                    timestamp=_as_float(entry["timestamp"]),
                 )
+                self._put(item)
             except (KeyError, TypeError, ValueError):
                 continue
-            self._items[item.id] = item
+        if self._journal.should_compact(len(self._table)):
+            self._journal.compact(self._snapshot)
 
-    def _persist(self) -> None:
-        if not self._storage_path:
+    def _snapshot(self) -> List[Dict[str, Any]]:
+        # value est écrite avec le reste mais recalculée au chargement (__post_init__).
+        return [{"op": "add", "item": position} for position in self.list_positions()]
+
+    def _log(self, record: Dict[str, Any]) -> None:
+        journal = self._journal
+        if not journal:
             return
-        payload = [self._serialize(item) for item in self._items.values()]
-        tmp_path = self._storage_path.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
-        tmp_path.replace(self._storage_path)
+        journal.append(record)
+        if journal.should_compact(len(self._table)):
+            journal.compact(self._snapshot)
+
+    def flush(self) -> None:
+        if self._journal:
+            self._journal.flush()
 
 
 @dataclass(slots=True)
@@ -125,33 +624,104 @@ class AlertItem:
     metric: str
     operator: str
     threshold: float
-    note: Optional[str]
+    note: str  # "" quand il n'y a pas de note
     timestamp: float
 
 
 class AlertStore:
+    """Alertes stockées en colonnes : seuils et opérateurs codés balayés d'un bloc par evaluate()."""
+
+    _FLOATS = ("threshold", "operator_code", "timestamp")
+    _OBJECTS = ("id", "ticker", "metric", "operator", "note")
+    _PERSISTED = ("id", "ticker", "metric", "operator", "threshold", "note", "timestamp")
+
     def __init__(self, storage_path: Optional[Path] = None) -> None:
-        self._alerts: Dict[str, AlertItem] = {}
+        self._table = ColumnTable(self._FLOATS, self._OBJECTS)
+        # Réentrant : une mutation journalise sous ce verrou (même ordre en mémoire et sur
+        # disque), et la compaction qu'elle déclenche relit l'état via list_*().
+        self._lock = threading.RLock()
+        # Corps JSON de GET /alerts, reconstruit seulement après une mutation.
+        self._listing_json: Optional[bytes] = None
         self._storage_path = storage_path
+        self._journal: Optional[StoreJournal] = None
         if self._storage_path:
             self._storage_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open_journal(self._storage_path, "alerts", self._PERSISTED)
             self._load_from_disk()
 
-    def list_alerts(self) -> List[Dict[str, Any]]:
-        return [self._serialize(alert) for alert in self._alerts.values()]
+    def list_alerts(self) -> List[AlertItem]:
+        with self._lock:
+            table = self._table
+            rows = table.live_rows()
+            objects = table.objects
+            columns = (
+                [objects["id"][row] for row in rows],
+                [objects["ticker"][row] for row in rows],
+                [objects["metric"][row] for row in rows],
+                [objects["operator"][row] for row in rows],
+                table.floats["threshold"][rows].tolist(),
+                [objects["note"][row] for row in rows],
+                table.floats["timestamp"][rows].tolist(),
+            )
+        return [AlertItem(*values) for values in zip(*columns)]
+
+    def list_alerts_json(self) -> bytes:
+        """{"alerts": [...]} déjà sérialisé, mis en cache jusqu'à la prochaine mutation."""
+        with self._lock:
+            if self._listing_json is None:
+                self._listing_json = dumps({"alerts": self.list_alerts()})
+            return self._listing_json
 
-    def add_alert(self, alert: AlertItem) -> Dict[str, Any]:
-        self._alerts[alert.id] = alert
-        payload = self._serialize(alert)
-        self._persist()
-        return payload
+    def add_alert(self, alert: AlertItem) -> AlertItem:
+        with self._lock:
+            self._put(alert)
+            self._listing_json = None
+            self._log({"op": "add", "item": alert})
+        return alert
 
     def delete_alert(self, alert_id: str) -> bool:
-        deleted = self._alerts.pop(alert_id, None) is not None
-        if deleted:
-            self._persist()
+        with self._lock:
+            deleted = self._table.remove(alert_id)
+            if deleted:
+                self._listing_json = None
+                self._log({"op": "del", "id": alert_id})
         return deleted
 
+    def evaluate(self, ticker: str, values: Dict[str, float]) -> List[AlertItem]:
+        """Alertes du ticker déclenchées par les valeurs courantes (métrique → valeur)."""
+        nan = math.nan
+        with self._lock:
+            table = self._table
+            objects = table.objects
+            floats = table.floats
+            rows = table.live_rows()
+            tickers = objects["ticker"]
+            rows = rows[np.fromiter((tickers[row] == ticker for row in rows), dtype=bool, count=rows.size)]
+            metrics = objects["metric"]
+            current = np.fromiter((values.get(metrics[row], nan) for row in rows), dtype=float, count=rows.size)
+            hits = rows[alert_mask(floats["threshold"][rows], floats["operator_code"][rows], current)].tolist()
+            return [
+                AlertItem(
+                    objects["id"][row],
+                    objects["ticker"][row],
+                    objects["metric"][row],
+                    objects["operator"][row],
+                    float(floats["threshold"][row]),
+                    objects["note"][row],
+                    float(floats["timestamp"][row]),
+                )
+                for row in hits
+            ]
+
+    def _put(self, alert: AlertItem) -> None:
+        values = self._serialize(alert)
+        # Ticker, métrique et opérateur se répètent d'une alerte à l'autre : chaînes internées.
+        values["ticker"] = sys.intern(alert.ticker)
+        values["metric"] = sys.intern(alert.metric)
+        values["operator"] = sys.intern(alert.operator)
+        values["operator_code"] = ALERT_OPERATORS.get(alert.operator, -1)
+        self._table.put(alert.id, values)
+
     @staticmethod
     def _serialize(alert: AlertItem) -> Dict[str, Any]:
         return {
@@ -165,31 +735,47 @@ class AlertStore:
         }
 
     def _load_from_disk(self) -> None:
-        if not self._storage_path or not self._storage_path.exists():
-            return
-        try:
-            data = json.loads(self._storage_path.read_text(encoding="utf-8") or "[]")
-        except (json.JSONDecodeError, OSError):
+        if not self._journal:
             return
-        for entry in data:
+        for record in self._journal.replay():
+            if not isinstance(record, dict):
+                continue
+            if record.get("op") == "del":
+                item_id = record.get("id")
+                if isinstance(item_id, str):
+                    self._table.remove(item_id)
+                continue
+            entry = record.get("item")
+            if not isinstance(entry, dict):
+                continue
+            # Une entrée mal formée est ignorée seule, sans bloquer le chargement du store.
             try:
                 alert = AlertItem(
                     id=entry["id"],
                     ticker=entry["ticker"],
                     metric=entry["metric"],
                     operator=entry["operator"],
-                    threshold=float(entry["threshold"]),
-                    note=entry.get("note"),
-                    timestamp=float(entry["timestamp"]),
+                    threshold=_as_float(entry["threshold"]),
+                    note=entry.get("note") or "",
+                    timestamp=_as_float(entry["timestamp"]),
                 )
+                self._put(alert)
             except (KeyError, TypeError, ValueError):
                 continue
-            self._alerts[alert.id] = alert
+        if self._journal.should_compact(len(self._table)):
+            self._journal.compact(self._snapshot)
+
+    def _snapshot(self) -> List[Dict[str, Any]]:
+        return [{"op": "add", "item": alert} for alert in self.list_alerts()]
 
-    def _persist(self) -> None:
-        if not self._storage_path:
+    def _log(self, record: Dict[str, Any]) -> None:
+        journal = self._journal
+        if not journal:
             return
-        payload = [self._serialize(alert) for alert in self._alerts.values()]
-        tmp_path = self._storage_path.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
-        tmp_path.replace(self._storage_path)
+        journal.append(record)
+        if journal.should_compact(len(self._table)):
+            journal.compact(self._snapshot)
+
+    def flush(self) -> None:
+        if self._journal:
+            self._journal.flush()
@@ -1,19 +1,50 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import os
+import sys
+import threading
+import uuid
+from dataclasses import fields
+from typing import Tuple
 
+from backend.app import FinancialData
 from backend.server.models import AnalysisRequest
 
+CacheKey = Tuple[str, float, float, str, Tuple[Tuple[str, float], ...]]
 
-def cache_key(payload: AnalysisRequest) -> str:
-    overrides_serialized = str(sorted((payload.overrides or {}).items()))
-    sector = payload.sector or ""
-    return "|".join(
-        [
-            payload.ticker,
-            f"{payload.wacc:.4f}",
-            f"{payload.terminalGrowth:.4f}",
-            sector,
-            overrides_serialized,
-        ]
+# Seuls les attributs de FinancialData sont appliqués par le pipeline ; les autres clés ne
+# doivent ni allonger la clé ni fragmenter le cache.
+_OVERRIDABLE = frozenset(field.name for field in fields(FinancialData))
+
+
+def cache_key(payload: AnalysisRequest) -> CacheKey:
+    """Clé tuple hashable (aucune sérialisation en chaîne à chaque requête), de taille bornée."""
+    raw_overrides = payload.overrides
+    overrides = (
+        tuple(sorted(item for item in raw_overrides.items() if item[0] in _OVERRIDABLE)) if raw_overrides else ()
     )
+    return (
+        payload.ticker,
+        round(payload.wacc, 6),
+        round(payload.terminalGrowth, 6),
+        sys.intern(payload.sector) if payload.sector else "",
+        overrides,
+    )
+
+
+_ID_BATCH = 1024
+_id_buffers = threading.local()
+
+
+def fast_id() -> str:
+    """
+    UUID v4 (chaîne) tiré d'un tampon os.urandom propre au thread, rechargé tous les
+    _ID_BATCH identifiants : un appel système pour mille au lieu d'un par création.
+    """
+    state = _id_buffers
+    offset = getattr(state, "offset", _ID_BATCH * 16)
+    if offset >= _ID_BATCH * 16:
+        state.buffer = os.urandom(_ID_BATCH * 16)
+        offset = 0
+    state.offset = offset + 16
+    return str(uuid.UUID(bytes=state.buffer[offset : offset + 16], version=4))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from backend import app as analyzer
+
+
+def fake_pipeline(ticker, wacc, terminal_growth, sector_override, allow_prompts, overrides):
+    return {"ticker": ticker, "notes": []}, {"overrides": overrides}
+
+
+class PipelineCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        analyzer.clear_pipeline_cache()
+        patches = [
+            mock.patch.object(analyzer, "_run_analysis_pipeline", side_effect=fake_pipeline),
+            mock.patch.object(analyzer, "TICKER_CACHE_TTL", 300),
+            mock.patch.object(analyzer, "_cache_bucket", return_value=1),
+        ]
+        self.run_pipeline = patches[0].start()
+        self.bucket = patches[2].start()
+        patches[1].start()
+        for patch in patches:
+            self.addCleanup(patch.stop)
+        self.addCleanup(analyzer.clear_pipeline_cache)
+
+    def analyze(self, ticker: str = "AAPL"):
+        return analyzer.run_analysis_pipeline(ticker, 0.08, 0.025, allow_prompts=False)
+
+    def test_callers_get_independent_copies(self) -> None:
+        payload, context = self.analyze()
+        payload["notes"].append("modifié")
+        context["overrides"] = {"price": 1.0}
+        again, again_context = self.analyze()
+        self.assertEqual(again, {"ticker": "AAPL", "notes": []})
+        self.assertIsNone(again_context["overrides"])
+        self.assertEqual(self.run_pipeline.call_count, 1)
+
+    def test_new_window_drops_previous_entries(self) -> None:
+        self.analyze("AAPL")
+        self.analyze("MSFT")
+        self.assertEqual(analyzer._cached_pipeline.cache_info().currsize, 2)
+        self.bucket.return_value = 2
+        self.analyze("AAPL")
+        self.assertEqual(analyzer._cached_pipeline.cache_info().currsize, 1)
+        self.assertEqual(self.run_pipeline.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.server.stores import AlertStore, PortfolioStore
+
+
+def write_journal(path: Path, lines: list[str]) -> None:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def add(item: object) -> str:
+    return json.dumps({"op": "add", "item": item})
+
+
+class JournalReplayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_portfolio_skips_malformed_entries(self) -> None:
+        path = self.directory / "portfolio.json"
+        position = {"id": "ok", "ticker": "AAPL", "quantity": 2, "price": 3.5, "note": None, "timestamp": 1}
+        write_journal(
+            path,
+            [
+                add(position),
+                add({**position, "id": "legacy", "quantity": "3"}),
+                add({**position, "id": "bad-price", "price": "abc"}),
+                add({**position, "id": "no-timestamp", "timestamp": None}),
+                add({key: value for key, value in position.items() if key != "ticker"}),
+                add(["not", "a", "dict"]),
+                add({**position, "id": "deleted"}),
+                json.dumps({"op": "del", "id": "deleted"}),
+                json.dumps({"op": "del", "id": ["ok"]}),
+                json.dumps({"op": "del"}),
+                json.dumps(["not", "a", "record"]),
+                '{"op": "add", "item": {"id": "torn"',
+            ],
+        )
+        store = PortfolioStore(path)
+        positions = {item.id: item for item in store.list_positions()}
+        self.assertEqual(set(positions), {"ok", "legacy"})
+        self.assertEqual(positions["ok"].value, 7.0)
+        self.assertEqual(positions["legacy"].quantity, 3.0)
+        self.assertEqual(positions["ok"].note, "")
+        self.assertEqual(store.total_value(), 7.0 + 3 * 3.5)
+
+    def test_alerts_skip_malformed_entries(self) -> None:
+        path = self.directory / "alerts.json"
+        alert = {
+            "id": "ok",
+            "ticker": "AAPL",
+            "metric": "prix",
+            "operator": ">",
+            "threshold": 5,
+            "note": None,
+            "timestamp": 1.0,
+        }
+        write_journal(
+            path,
+            [
+                add(alert),
+                add({**alert, "id": "bad-threshold", "threshold": "abc"}),
+                add({**alert, "id": "no-timestamp", "timestamp": None}),
+                add({**alert, "id": "bad-metric", "metric": ["prix"]}),
+                add("not a dict"),
+                json.dumps({"op": "del", "id": ["ok"]}),
+                json.dumps({"op": "del", "id": 1}),
+            ],
+        )
+        store = AlertStore(path)
+        self.assertEqual([item.id for item in store.list_alerts()], ["ok"])
+        self.assertEqual([item.id for item in store.evaluate("AAPL", {"prix": 6.0})], ["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()